@@ -17,6 +17,7 @@ Arguments:
 Options:
     -h --help          Show this help message
     --version          Show version
+    --no-cache         Don't read or store cached registration search results
 """
 
 import sys
@@ -26,6 +27,7 @@ from typing import Optional, Tuple
 
 from . import __version__
 from .config import Config
+from .io import map_file
 from .il2cpp.metadata import Metadata, NotSupportedError
 from .il2cpp.base import Il2Cpp
 from .formats.elf import Elf, Elf64
@@ -173,13 +175,12 @@ def init(il2cpp_path: str, metadata_path: str, config: Config) -> Tuple[Metadata
         Tuple of (Metadata, Il2Cpp)
     """
     print("Initializing metadata...")
-    metadata_bytes = Path(metadata_path).read_bytes()
-    metadata = Metadata(metadata_bytes)
+    metadata = Metadata.from_path(metadata_path)
     print(f"Metadata Version: {metadata.version}")
 
     print("Initializing il2cpp file...")
-    il2cpp_bytes = Path(il2cpp_path).read_bytes()
-    il2cpp = create_il2cpp_parser(il2cpp_bytes)
+    il2cpp = create_il2cpp_parser(map_file(il2cpp_path))
+    il2cpp.use_search_cache = config.cache_search_results
 
     # Set version
     version = config.force_version if config.force_il2cpp_version else metadata.version
@@ -276,6 +277,8 @@ def main():
     parser.add_argument('files', nargs='*', help='IL2CPP binary, metadata file, and/or output directory')
     parser.add_argument('--version', action='version', version=f'il2cpp_dumper {__version__}')
     parser.add_argument('--config', type=str, help='Path to config.json')
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Don't read or store cached registration search results")
 
     args = parser.parse_args()
 
@@ -287,6 +290,8 @@ def main():
     # Load config
     config_path = Path(args.config) if args.config else None
     config = Config.load(config_path)
+    if args.no_cache:
+        config.cache_search_results = False
 
     # Detect files
     il2cpp_path, metadata_path, output_dir = detect_files(args.files)
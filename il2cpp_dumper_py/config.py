@@ -28,6 +28,7 @@ class Config:
 
     # Runtime options
     require_any_key: bool = True
+    cache_search_results: bool = True
 
     # Version override
     force_il2cpp_version: bool = False
@@ -5,7 +5,8 @@ This module provides the core logic for resolving IL2CPP types to their
 string representations, handling generics, and managing metadata lookups.
 """
 
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+import array
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..il2cpp.metadata import Metadata
@@ -13,6 +14,7 @@ if TYPE_CHECKING:
 
 from ..il2cpp.structures import (
     Il2CppType,
+    Il2CppArrayType,
     Il2CppTypeDefinition,
     Il2CppMethodDefinition,
     Il2CppGenericInst,
@@ -53,7 +55,7 @@ class Il2CppExecutor:
         """
         self.metadata = metadata
         self.il2cpp = il2cpp
-        self.custom_attribute_generators: List[int] = []
+        self.custom_attribute_generators: Sequence[int] = []
 
         # Caches for performance
         self._type_name_cache: Dict[int, str] = {}  # id(il2cpp_type) -> type_name
@@ -67,21 +69,21 @@ class Il2CppExecutor:
         # Build custom attribute generators for v27-28
         if 27 <= il2cpp.version < 29:
             total_count = sum(img.custom_attribute_count for img in metadata.image_defs)
-            self.custom_attribute_generators = [0] * total_count
+            generators = array.array('I' if il2cpp.is_32bit else 'Q',
+                                     bytes(total_count * il2cpp.pointer_size))
+            self.custom_attribute_generators = generators
 
             for image_def in metadata.image_defs:
                 image_name = metadata.get_string_from_index(image_def.name_index)
                 if image_name in il2cpp.code_gen_modules:
                     code_gen_module = il2cpp.code_gen_modules[image_name]
                     if image_def.custom_attribute_count > 0:
-                        pointers = il2cpp.read_ptr_array(
+                        # Copied in as one native-width block
+                        start = image_def.custom_attribute_start
+                        generators[start:start + image_def.custom_attribute_count] = il2cpp.read_ptr_table(
                             il2cpp.map_vatr(code_gen_module.custom_attribute_cache_generator),
                             image_def.custom_attribute_count
                         )
-                        for i, ptr in enumerate(pointers):
-                            self.custom_attribute_generators[
-                                image_def.custom_attribute_start + i
-                            ] = ptr
 
         elif il2cpp.version < 27:
             self.custom_attribute_generators = il2cpp.custom_attribute_generators
@@ -123,15 +125,11 @@ class Il2CppExecutor:
 
         # Handle arrays
         if type_enum == Il2CppTypeEnum.IL2CPP_TYPE_ARRAY:
-            array_type = self.il2cpp.map_vatr_class(
-                type(self.il2cpp).__module__ + '.Il2CppArrayType',
-                il2cpp_type.array
-            )
-            # Fallback for simple handling
-            element_type = self.il2cpp.get_il2cpp_type(il2cpp_type.array)
+            array_type = self.il2cpp.map_vatr_class(Il2CppArrayType, il2cpp_type.array)
+            element_type = self.il2cpp.get_il2cpp_type(array_type.etype)
             if element_type:
                 element_name = self.get_type_name(element_type, add_namespace, False)
-                return f"{element_name}[,]"  # Multi-dimensional array
+                return f"{element_name}[{',' * (array_type.rank - 1)}]"  # Multi-dimensional array
             return "object[]"
 
         # Handle single-dimension arrays
@@ -209,7 +207,7 @@ class Il2CppExecutor:
             # Add generic parameters
             if generic_class is not None:
                 # Use cache for generic inst reads
-                gi_addr = generic_class.context.class_inst
+                gi_addr = generic_class.class_inst
                 if gi_addr in self._generic_inst_cache:
                     generic_inst = self._generic_inst_cache[gi_addr]
                 else:
@@ -291,7 +289,7 @@ class Il2CppExecutor:
             return self._generic_inst_params_cache[cache_key]
 
         param_names = []
-        pointers = self.il2cpp.map_vatr_array(
+        pointers = self.il2cpp.map_vatr_ptr_table(
             generic_inst.type_argv, generic_inst.type_argc
         )
 
@@ -5,11 +5,13 @@ Supports both ELF32 (32-bit) and ELF64 (64-bit) formats,
 commonly used for Android (libil2cpp.so) and Linux binaries.
 """
 
-from typing import List, Optional, Dict, Any
+import struct
+from typing import List, Optional, Dict, Any, Tuple
 from abc import abstractmethod
 
 from ..il2cpp.base import Il2Cpp
 from ..search.section_helper import SectionHelper, SearchSection
+from .range_index import build_range_index, find_range
 from .elf_structures import (
     Elf32_Ehdr, Elf64_Ehdr,
     Elf32_Phdr, Elf64_Phdr,
@@ -29,6 +31,9 @@ from .elf_structures import (
 )
 from ..utils.pattern_search import search_pattern
 
+# Elf64_Rela entry: r_offset, r_info, r_addend (24 bytes)
+_ELF64_RELA_STRUCT = struct.Struct('<QQq')
+
 
 class ElfBase(Il2Cpp):
     """Base class for ELF format parsing."""
@@ -48,6 +53,20 @@ class ElfBase(Il2Cpp):
         """Reload after setting image base for memory dumps."""
         self._load()
 
+    def _build_address_index(self) -> None:
+        """Index program segments the way map_vatr() scans them."""
+        # map_vatr() accepts the byte just past each segment, hence the + 1
+        self._va_starts, self._va_ends, self._va_to_raw = build_range_index(
+            (phdr.p_vaddr, phdr.p_vaddr + phdr.p_memsz + 1, phdr.p_offset - phdr.p_vaddr)
+            for phdr in self._program_segments)
+
+    def _vatr_linear_range(self, addr: int) -> Optional[Tuple[int, int]]:
+        """Segment run containing addr."""
+        i = find_range(self._va_starts, self._va_ends, addr)
+        if i < 0:
+            return None
+        return self._va_starts[i], self._va_ends[i]
+
     @abstractmethod
     def _check_section(self) -> bool:
         """Check if sections are valid."""
@@ -79,6 +98,7 @@ class Elf(ElfBase):
 
         if self.is_dumped:
             self._fix_program_segments()
+        self._build_address_index()
 
         # Find PT_DYNAMIC segment
         self._pt_dynamic = None
@@ -494,6 +514,7 @@ class Elf64(ElfBase):
 
         if self.is_dumped:
             self._fix_program_segments()
+        self._build_address_index()
 
         # Find PT_DYNAMIC segment
         self._pt_dynamic = None
@@ -653,13 +674,11 @@ class Elf64(ElfBase):
             self.position = rela_offset
             rela_data = self.read_bytes(rela_size)
 
-            # Get raw buffer for direct writes (much faster than stream seeks)
-            raw_buffer = self._stream.getvalue()
-            if isinstance(raw_buffer, bytes):
+            # Patch the backing buffer in place (much faster than stream seeks)
+            raw_buffer = self._data
+            if not isinstance(raw_buffer, bytearray):
                 raw_buffer = bytearray(raw_buffer)
-                # Replace stream with mutable version
-                from io import BytesIO
-                self._stream = BytesIO(raw_buffer)
+                self._data = raw_buffer
 
             # Build segment mapping for fast VA->file offset lookup
             from .elf_structures import PT_LOAD
@@ -674,10 +693,10 @@ class Elf64(ElfBase):
                         return va - va_start + file_offset
                 return None
 
-            import struct
+            unpack_rela = _ELF64_RELA_STRUCT.unpack_from
             for i in range(count):
                 offset = i * 24
-                r_offset, r_info, r_addend = struct.unpack_from('<QQq', rela_data, offset)
+                r_offset, r_info, r_addend = unpack_rela(rela_data, offset)
 
                 rel_type = r_info & 0xFFFFFFFF
                 sym = r_info >> 32
@@ -701,11 +720,6 @@ class Elf64(ElfBase):
                     write_pos = fast_map_va(r_offset)
                     if write_pos is not None and write_pos + 8 <= len(raw_buffer):
                         struct.pack_into('<Q', raw_buffer, write_pos, value)
-
-            # CRITICAL: Replace stream with the modified buffer
-            # BytesIO copies the data, so we need to create a new stream with modified data
-            from io import BytesIO
-            self._stream = BytesIO(bytes(raw_buffer))
         except Exception:
             pass  # Silently ignore relocation errors
 
@@ -6,10 +6,10 @@ FAT (Universal) binaries containing multiple architectures.
 """
 
 from typing import List, Optional, Dict, Tuple
-from io import BytesIO
 
 from ..il2cpp.base import Il2Cpp
 from ..search.section_helper import SectionHelper, SearchSection
+from .range_index import build_range_index, find_range
 from .macho_structures import (
     MachHeader, MachHeader64,
     SegmentCommand, SegmentCommand64,
@@ -17,9 +17,10 @@ from .macho_structures import (
     SymtabCommand, Nlist, Nlist64,
     EncryptionInfoCommand, EncryptionInfoCommand64,
     FatHeader, FatArch,
+    LOAD_COMMAND_STRUCT, NLIST_STRUCT, NLIST64_STRUCT,
     MH_MAGIC, MH_MAGIC_64, FAT_MAGIC, FAT_CIGAM,
     LC_SEGMENT, LC_SEGMENT_64, LC_SYMTAB, LC_ENCRYPTION_INFO, LC_ENCRYPTION_INFO_64,
-    S_ATTR_PURE_INSTRUCTIONS, S_ATTR_SOME_INSTRUCTIONS,
+    S_ATTR_INSTRUCTIONS,
 )
 
 
@@ -32,31 +33,23 @@ class MachoFat:
 
     def __init__(self, data: bytes):
         self._data = data
-        self._stream = BytesIO(data)
         self.fats: List[Tuple[int, FatArch]] = []  # (magic, FatArch)
         self._load()
 
     def _load(self) -> None:
         """Load FAT header and architecture entries."""
-        self._stream.seek(0)
-        magic = int.from_bytes(self._stream.read(4), 'big')
+        header = FatHeader.unpack_from(self._data, 0)
 
-        if magic not in (FAT_MAGIC, FAT_CIGAM):
+        if header.magic not in (FAT_MAGIC, FAT_CIGAM):
             raise ValueError("Not a FAT Mach-O file")
 
-        nfat_arch = int.from_bytes(self._stream.read(4), 'big')
-
-        for _ in range(nfat_arch):
-            arch = FatArch()
-            arch.cputype = int.from_bytes(self._stream.read(4), 'big')
-            arch.cpusubtype = int.from_bytes(self._stream.read(4), 'big')
-            arch.offset = int.from_bytes(self._stream.read(4), 'big')
-            arch.size = int.from_bytes(self._stream.read(4), 'big')
-            arch.align = int.from_bytes(self._stream.read(4), 'big')
+        offset = FatHeader.SIZE
+        for _ in range(header.nfat_arch):
+            arch = FatArch.unpack_from(self._data, offset)
+            offset += FatArch.SIZE
 
             # Peek at the magic to determine 32/64 bit
-            self._stream.seek(arch.offset)
-            slice_magic = int.from_bytes(self._stream.read(4), 'little')
+            slice_magic = int.from_bytes(self._data[arch.offset:arch.offset + 4], 'little')
             self.fats.append((slice_magic, arch))
 
     def get_macho(self, index: int) -> bytes:
@@ -96,8 +89,8 @@ class Macho(Il2Cpp):
 
         for _ in range(self._header.ncmds):
             cmd_pos = self.position
-            cmd = self.read_uint32()
-            cmdsize = self.read_uint32()
+            cmd, cmdsize = LOAD_COMMAND_STRUCT.unpack_from(self._data, cmd_pos)
+            self.position = cmd_pos + LOAD_COMMAND_STRUCT.size
 
             if cmd == LC_SEGMENT:
                 self.position = cmd_pos
@@ -119,6 +112,8 @@ class Macho(Il2Cpp):
 
             self.position = cmd_pos + cmdsize
 
+        self._build_address_index()
+
         # Load symbols
         if self._symtab:
             self._load_symbols()
@@ -129,68 +124,23 @@ class Macho(Il2Cpp):
 
     def _read_header(self) -> MachHeader:
         """Read Mach-O header."""
-        header = MachHeader()
-        header.magic = self.read_uint32()
-        header.cputype = self.read_int32()
-        header.cpusubtype = self.read_int32()
-        header.filetype = self.read_uint32()
-        header.ncmds = self.read_uint32()
-        header.sizeofcmds = self.read_uint32()
-        header.flags = self.read_uint32()
-        return header
+        return self.read_record(MachHeader)
 
     def _read_segment_command(self) -> SegmentCommand:
         """Read segment load command."""
-        segment = SegmentCommand()
-        segment.cmd = self.read_uint32()
-        segment.cmdsize = self.read_uint32()
-        segment.segname = self.read_bytes(16).rstrip(b'\x00').decode('ascii', errors='replace')
-        segment.vmaddr = self.read_uint32()
-        segment.vmsize = self.read_uint32()
-        segment.fileoff = self.read_uint32()
-        segment.filesize = self.read_uint32()
-        segment.maxprot = self.read_int32()
-        segment.initprot = self.read_int32()
-        segment.nsects = self.read_uint32()
-        segment.flags = self.read_uint32()
-        return segment
+        return self.read_record(SegmentCommand)
 
     def _read_section(self) -> MachoSection:
         """Read section."""
-        section = MachoSection()
-        section.sectname = self.read_bytes(16).rstrip(b'\x00').decode('ascii', errors='replace')
-        section.segname = self.read_bytes(16).rstrip(b'\x00').decode('ascii', errors='replace')
-        section.addr = self.read_uint32()
-        section.size = self.read_uint32()
-        section.offset = self.read_uint32()
-        section.align = self.read_uint32()
-        section.reloff = self.read_uint32()
-        section.nreloc = self.read_uint32()
-        section.flags = self.read_uint32()
-        section.reserved1 = self.read_uint32()
-        section.reserved2 = self.read_uint32()
-        return section
+        return self.read_record(MachoSection)
 
     def _read_symtab_command(self) -> SymtabCommand:
         """Read symbol table command."""
-        symtab = SymtabCommand()
-        symtab.cmd = self.read_uint32()
-        symtab.cmdsize = self.read_uint32()
-        symtab.symoff = self.read_uint32()
-        symtab.nsyms = self.read_uint32()
-        symtab.stroff = self.read_uint32()
-        symtab.strsize = self.read_uint32()
-        return symtab
+        return self.read_record(SymtabCommand)
 
     def _read_encryption_info(self) -> EncryptionInfoCommand:
         """Read encryption info command."""
-        enc = EncryptionInfoCommand()
-        enc.cmd = self.read_uint32()
-        enc.cmdsize = self.read_uint32()
-        enc.cryptoff = self.read_uint32()
-        enc.cryptsize = self.read_uint32()
-        enc.cryptid = self.read_uint32()
-        return enc
+        return self.read_record(EncryptionInfoCommand)
 
     def _load_symbols(self) -> None:
         """Load symbol table."""
@@ -201,16 +151,9 @@ class Macho(Il2Cpp):
         self.position = self._symtab.stroff
         self._string_table = self.read_bytes(self._symtab.strsize)
 
-        # Read symbols
-        self.position = self._symtab.symoff
-        for _ in range(self._symtab.nsyms):
-            sym = Nlist()
-            sym.n_strx = self.read_uint32()
-            sym.n_type = self.read_byte()
-            sym.n_sect = self.read_byte()
-            sym.n_desc = self.read_int16()
-            sym.n_value = self.read_uint32()
-            self._symbols.append(sym)
+        # Read symbols; a table running past the end of the file raises
+        self._symbols = [Nlist(*values) for values in
+                         self.unpack_records(NLIST_STRUCT, self._symtab.symoff, self._symtab.nsyms)]
 
     def _get_symbol_name(self, sym: Nlist) -> str:
         """Get symbol name from string table."""
@@ -228,6 +171,18 @@ class Macho(Il2Cpp):
                 return addr - segment.vmaddr + segment.fileoff
         raise ValueError(f"Address 0x{addr:x} not in any segment")
 
+    def _build_address_index(self) -> None:
+        """Index segments the way map_vatr() scans them."""
+        self._va_starts, self._va_ends, self._va_to_raw = build_range_index(
+            (s.vmaddr, s.vmaddr + s.vmsize, s.fileoff - s.vmaddr) for s in self._segments)
+
+    def _vatr_linear_range(self, addr: int) -> Optional[Tuple[int, int]]:
+        """Segment run containing addr."""
+        i = find_range(self._va_starts, self._va_ends, addr)
+        if i < 0:
+            return None
+        return self._va_starts[i], self._va_ends[i]
+
     def map_rtva(self, addr: int) -> int:
         """Map raw file offset to virtual address."""
         for segment in self._segments:
@@ -280,8 +235,7 @@ class Macho(Il2Cpp):
                 address_end=section.addr + section.size
             )
 
-            if (section.flags & S_ATTR_PURE_INSTRUCTIONS) != 0 or \
-               (section.flags & S_ATTR_SOME_INSTRUCTIONS) != 0:
+            if section.flags & S_ATTR_INSTRUCTIONS:
                 exec_list.append(search_section)
             else:
                 data_list.append(search_section)
@@ -331,8 +285,8 @@ class Macho64(Il2Cpp):
 
         for _ in range(self._header.ncmds):
             cmd_pos = self.position
-            cmd = self.read_uint32()
-            cmdsize = self.read_uint32()
+            cmd, cmdsize = LOAD_COMMAND_STRUCT.unpack_from(self._data, cmd_pos)
+            self.position = cmd_pos + LOAD_COMMAND_STRUCT.size
 
             if cmd == LC_SEGMENT_64:
                 self.position = cmd_pos
@@ -354,6 +308,8 @@ class Macho64(Il2Cpp):
 
             self.position = cmd_pos + cmdsize
 
+        self._build_address_index()
+
         # Load symbols
         if self._symtab:
             self._load_symbols()
@@ -364,71 +320,23 @@ class Macho64(Il2Cpp):
 
     def _read_header(self) -> MachHeader64:
         """Read Mach-O 64-bit header."""
-        header = MachHeader64()
-        header.magic = self.read_uint32()
-        header.cputype = self.read_int32()
-        header.cpusubtype = self.read_int32()
-        header.filetype = self.read_uint32()
-        header.ncmds = self.read_uint32()
-        header.sizeofcmds = self.read_uint32()
-        header.flags = self.read_uint32()
-        header.reserved = self.read_uint32()
-        return header
+        return self.read_record(MachHeader64)
 
     def _read_segment_command(self) -> SegmentCommand64:
         """Read segment load command."""
-        segment = SegmentCommand64()
-        segment.cmd = self.read_uint32()
-        segment.cmdsize = self.read_uint32()
-        segment.segname = self.read_bytes(16).rstrip(b'\x00').decode('ascii', errors='replace')
-        segment.vmaddr = self.read_uint64()
-        segment.vmsize = self.read_uint64()
-        segment.fileoff = self.read_uint64()
-        segment.filesize = self.read_uint64()
-        segment.maxprot = self.read_int32()
-        segment.initprot = self.read_int32()
-        segment.nsects = self.read_uint32()
-        segment.flags = self.read_uint32()
-        return segment
+        return self.read_record(SegmentCommand64)
 
     def _read_section(self) -> MachoSection64Bit:
         """Read section."""
-        section = MachoSection64Bit()
-        section.sectname = self.read_bytes(16).rstrip(b'\x00').decode('ascii', errors='replace')
-        section.segname = self.read_bytes(16).rstrip(b'\x00').decode('ascii', errors='replace')
-        section.addr = self.read_uint64()
-        section.size = self.read_uint64()
-        section.offset = self.read_uint32()
-        section.align = self.read_uint32()
-        section.reloff = self.read_uint32()
-        section.nreloc = self.read_uint32()
-        section.flags = self.read_uint32()
-        section.reserved1 = self.read_uint32()
-        section.reserved2 = self.read_uint32()
-        section.reserved3 = self.read_uint32()
-        return section
+        return self.read_record(MachoSection64Bit)
 
     def _read_symtab_command(self) -> SymtabCommand:
         """Read symbol table command."""
-        symtab = SymtabCommand()
-        symtab.cmd = self.read_uint32()
-        symtab.cmdsize = self.read_uint32()
-        symtab.symoff = self.read_uint32()
-        symtab.nsyms = self.read_uint32()
-        symtab.stroff = self.read_uint32()
-        symtab.strsize = self.read_uint32()
-        return symtab
+        return self.read_record(SymtabCommand)
 
     def _read_encryption_info(self) -> EncryptionInfoCommand64:
         """Read encryption info command."""
-        enc = EncryptionInfoCommand64()
-        enc.cmd = self.read_uint32()
-        enc.cmdsize = self.read_uint32()
-        enc.cryptoff = self.read_uint32()
-        enc.cryptsize = self.read_uint32()
-        enc.cryptid = self.read_uint32()
-        enc.pad = self.read_uint32()
-        return enc
+        return self.read_record(EncryptionInfoCommand64)
 
     def _load_symbols(self) -> None:
         """Load symbol table."""
@@ -439,16 +347,9 @@ class Macho64(Il2Cpp):
         self.position = self._symtab.stroff
         self._string_table = self.read_bytes(self._symtab.strsize)
 
-        # Read symbols
-        self.position = self._symtab.symoff
-        for _ in range(self._symtab.nsyms):
-            sym = Nlist64()
-            sym.n_strx = self.read_uint32()
-            sym.n_type = self.read_byte()
-            sym.n_sect = self.read_byte()
-            sym.n_desc = self.read_uint16()
-            sym.n_value = self.read_uint64()
-            self._symbols.append(sym)
+        # Read symbols; a table running past the end of the file raises
+        self._symbols = [Nlist64(*values) for values in
+                         self.unpack_records(NLIST64_STRUCT, self._symtab.symoff, self._symtab.nsyms)]
 
     def _get_symbol_name(self, sym: Nlist64) -> str:
         """Get symbol name from string table."""
@@ -466,6 +367,18 @@ class Macho64(Il2Cpp):
                 return addr - segment.vmaddr + segment.fileoff
         raise ValueError(f"Address 0x{addr:x} not in any segment")
 
+    def _build_address_index(self) -> None:
+        """Index segments the way map_vatr() scans them."""
+        self._va_starts, self._va_ends, self._va_to_raw = build_range_index(
+            (s.vmaddr, s.vmaddr + s.vmsize, s.fileoff - s.vmaddr) for s in self._segments)
+
+    def _vatr_linear_range(self, addr: int) -> Optional[Tuple[int, int]]:
+        """Segment run containing addr."""
+        i = find_range(self._va_starts, self._va_ends, addr)
+        if i < 0:
+            return None
+        return self._va_starts[i], self._va_ends[i]
+
     def map_rtva(self, addr: int) -> int:
         """Map raw file offset to virtual address."""
         for segment in self._segments:
@@ -518,8 +431,7 @@ class Macho64(Il2Cpp):
                 address_end=section.addr + section.size
             )
 
-            if (section.flags & S_ATTR_PURE_INSTRUCTIONS) != 0 or \
-               (section.flags & S_ATTR_SOME_INSTRUCTIONS) != 0:
+            if section.flags & S_ATTR_INSTRUCTIONS:
                 exec_list.append(search_section)
             else:
                 data_list.append(search_section)
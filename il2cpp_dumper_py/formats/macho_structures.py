@@ -2,7 +2,10 @@
 Mach-O format structure definitions for macOS/iOS binaries.
 """
 
+import struct
+import sys
 from dataclasses import dataclass
+from enum import IntEnum, IntFlag
 from typing import List
 
 
@@ -14,74 +17,184 @@ MH_CIGAM_64 = 0xCFFAEDFE  # 64-bit byte-swapped
 FAT_MAGIC = 0xCAFEBABE    # Universal binary
 FAT_CIGAM = 0xBEBAFECA    # Universal binary byte-swapped
 
+
+class CpuType(IntEnum):
+    """Mach-O CPU types."""
+    X86 = 0x00000007
+    X86_64 = 0x01000007
+    ARM = 0x0000000C
+    ARM64 = 0x0100000C
+
+
+class LoadCommandType(IntEnum):
+    """Mach-O load command types."""
+    SEGMENT = 0x1
+    SYMTAB = 0x2
+    SYMSEG = 0x3
+    THREAD = 0x4
+    UNIXTHREAD = 0x5
+    LOADFVMLIB = 0x6
+    IDFVMLIB = 0x7
+    IDENT = 0x8
+    FVMFILE = 0x9
+    PREPAGE = 0xA
+    DYSYMTAB = 0xB
+    LOAD_DYLIB = 0xC
+    ID_DYLIB = 0xD
+    LOAD_DYLINKER = 0xE
+    ID_DYLINKER = 0xF
+    PREBOUND_DYLIB = 0x10
+    ROUTINES = 0x11
+    SUB_FRAMEWORK = 0x12
+    SUB_UMBRELLA = 0x13
+    SUB_CLIENT = 0x14
+    SUB_LIBRARY = 0x15
+    TWOLEVEL_HINTS = 0x16
+    PREBIND_CKSUM = 0x17
+    SEGMENT_64 = 0x19
+    ROUTINES_64 = 0x1A
+    UUID = 0x1B
+    ENCRYPTION_INFO = 0x21
+    ENCRYPTION_INFO_64 = 0x2C
+    DYLD_INFO = 0x22
+    DYLD_INFO_ONLY = 0x80000022
+    FUNCTION_STARTS = 0x26
+    MAIN = 0x80000028
+
+
+class SectionType(IntEnum):
+    """Section types (low byte of section flags)."""
+    REGULAR = 0x0
+    ZEROFILL = 0x1
+    CSTRING_LITERALS = 0x2
+    LITERALS_4BYTE = 0x3
+    LITERALS_8BYTE = 0x4
+    LITERAL_POINTERS = 0x5
+    NON_LAZY_SYMBOL_POINTERS = 0x6
+    LAZY_SYMBOL_POINTERS = 0x7
+    SYMBOL_STUBS = 0x8
+    MOD_INIT_FUNC_POINTERS = 0x9
+    MOD_TERM_FUNC_POINTERS = 0xA
+    COALESCED = 0xB
+    GB_ZEROFILL = 0xC
+    INTERPOSING = 0xD
+    LITERALS_16BYTE = 0xE
+
+
+class SectionAttribute(IntFlag):
+    """Section attributes (high bits of section flags)."""
+    PURE_INSTRUCTIONS = 0x80000000
+    NO_TOC = 0x40000000
+    STRIP_STATIC_SYMS = 0x20000000
+    NO_DEAD_STRIP = 0x10000000
+    LIVE_SUPPORT = 0x08000000
+    SELF_MODIFYING_CODE = 0x04000000
+    DEBUG = 0x02000000
+    SOME_INSTRUCTIONS = 0x00000400
+    EXT_RELOC = 0x00000200
+    LOC_RELOC = 0x00000100
+
+
+# Backwards-compatible module-level names
 # CPU types
-CPU_TYPE_X86 = 0x00000007
-CPU_TYPE_X86_64 = 0x01000007
-CPU_TYPE_ARM = 0x0000000C
-CPU_TYPE_ARM64 = 0x0100000C
+CPU_TYPE_X86 = CpuType.X86
+CPU_TYPE_X86_64 = CpuType.X86_64
+CPU_TYPE_ARM = CpuType.ARM
+CPU_TYPE_ARM64 = CpuType.ARM64
 
 # Load command types
-LC_SEGMENT = 0x1
-LC_SYMTAB = 0x2
-LC_SYMSEG = 0x3
-LC_THREAD = 0x4
-LC_UNIXTHREAD = 0x5
-LC_LOADFVMLIB = 0x6
-LC_IDFVMLIB = 0x7
-LC_IDENT = 0x8
-LC_FVMFILE = 0x9
-LC_PREPAGE = 0xA
-LC_DYSYMTAB = 0xB
-LC_LOAD_DYLIB = 0xC
-LC_ID_DYLIB = 0xD
-LC_LOAD_DYLINKER = 0xE
-LC_ID_DYLINKER = 0xF
-LC_PREBOUND_DYLIB = 0x10
-LC_ROUTINES = 0x11
-LC_SUB_FRAMEWORK = 0x12
-LC_SUB_UMBRELLA = 0x13
-LC_SUB_CLIENT = 0x14
-LC_SUB_LIBRARY = 0x15
-LC_TWOLEVEL_HINTS = 0x16
-LC_PREBIND_CKSUM = 0x17
-LC_SEGMENT_64 = 0x19
-LC_ROUTINES_64 = 0x1A
-LC_UUID = 0x1B
-LC_ENCRYPTION_INFO = 0x21
-LC_ENCRYPTION_INFO_64 = 0x2C
-LC_DYLD_INFO = 0x22
-LC_DYLD_INFO_ONLY = 0x80000022
-LC_FUNCTION_STARTS = 0x26
-LC_MAIN = 0x80000028
+LC_SEGMENT = LoadCommandType.SEGMENT
+LC_SYMTAB = LoadCommandType.SYMTAB
+LC_SYMSEG = LoadCommandType.SYMSEG
+LC_THREAD = LoadCommandType.THREAD
+LC_UNIXTHREAD = LoadCommandType.UNIXTHREAD
+LC_LOADFVMLIB = LoadCommandType.LOADFVMLIB
+LC_IDFVMLIB = LoadCommandType.IDFVMLIB
+LC_IDENT = LoadCommandType.IDENT
+LC_FVMFILE = LoadCommandType.FVMFILE
+LC_PREPAGE = LoadCommandType.PREPAGE
+LC_DYSYMTAB = LoadCommandType.DYSYMTAB
+LC_LOAD_DYLIB = LoadCommandType.LOAD_DYLIB
+LC_ID_DYLIB = LoadCommandType.ID_DYLIB
+LC_LOAD_DYLINKER = LoadCommandType.LOAD_DYLINKER
+LC_ID_DYLINKER = LoadCommandType.ID_DYLINKER
+LC_PREBOUND_DYLIB = LoadCommandType.PREBOUND_DYLIB
+LC_ROUTINES = LoadCommandType.ROUTINES
+LC_SUB_FRAMEWORK = LoadCommandType.SUB_FRAMEWORK
+LC_SUB_UMBRELLA = LoadCommandType.SUB_UMBRELLA
+LC_SUB_CLIENT = LoadCommandType.SUB_CLIENT
+LC_SUB_LIBRARY = LoadCommandType.SUB_LIBRARY
+LC_TWOLEVEL_HINTS = LoadCommandType.TWOLEVEL_HINTS
+LC_PREBIND_CKSUM = LoadCommandType.PREBIND_CKSUM
+LC_SEGMENT_64 = LoadCommandType.SEGMENT_64
+LC_ROUTINES_64 = LoadCommandType.ROUTINES_64
+LC_UUID = LoadCommandType.UUID
+LC_ENCRYPTION_INFO = LoadCommandType.ENCRYPTION_INFO
+LC_ENCRYPTION_INFO_64 = LoadCommandType.ENCRYPTION_INFO_64
+LC_DYLD_INFO = LoadCommandType.DYLD_INFO
+LC_DYLD_INFO_ONLY = LoadCommandType.DYLD_INFO_ONLY
+LC_FUNCTION_STARTS = LoadCommandType.FUNCTION_STARTS
+LC_MAIN = LoadCommandType.MAIN
 
 # Section types
-S_REGULAR = 0x0
-S_ZEROFILL = 0x1
-S_CSTRING_LITERALS = 0x2
-S_4BYTE_LITERALS = 0x3
-S_8BYTE_LITERALS = 0x4
-S_LITERAL_POINTERS = 0x5
-S_NON_LAZY_SYMBOL_POINTERS = 0x6
-S_LAZY_SYMBOL_POINTERS = 0x7
-S_SYMBOL_STUBS = 0x8
-S_MOD_INIT_FUNC_POINTERS = 0x9
-S_MOD_TERM_FUNC_POINTERS = 0xA
-S_COALESCED = 0xB
-S_GB_ZEROFILL = 0xC
-S_INTERPOSING = 0xD
-S_16BYTE_LITERALS = 0xE
+S_REGULAR = SectionType.REGULAR
+S_ZEROFILL = SectionType.ZEROFILL
+S_CSTRING_LITERALS = SectionType.CSTRING_LITERALS
+S_4BYTE_LITERALS = SectionType.LITERALS_4BYTE
+S_8BYTE_LITERALS = SectionType.LITERALS_8BYTE
+S_LITERAL_POINTERS = SectionType.LITERAL_POINTERS
+S_NON_LAZY_SYMBOL_POINTERS = SectionType.NON_LAZY_SYMBOL_POINTERS
+S_LAZY_SYMBOL_POINTERS = SectionType.LAZY_SYMBOL_POINTERS
+S_SYMBOL_STUBS = SectionType.SYMBOL_STUBS
+S_MOD_INIT_FUNC_POINTERS = SectionType.MOD_INIT_FUNC_POINTERS
+S_MOD_TERM_FUNC_POINTERS = SectionType.MOD_TERM_FUNC_POINTERS
+S_COALESCED = SectionType.COALESCED
+S_GB_ZEROFILL = SectionType.GB_ZEROFILL
+S_INTERPOSING = SectionType.INTERPOSING
+S_16BYTE_LITERALS = SectionType.LITERALS_16BYTE
 
 # Section attributes
-S_ATTR_PURE_INSTRUCTIONS = 0x80000000
-S_ATTR_NO_TOC = 0x40000000
-S_ATTR_STRIP_STATIC_SYMS = 0x20000000
-S_ATTR_NO_DEAD_STRIP = 0x10000000
-S_ATTR_LIVE_SUPPORT = 0x08000000
-S_ATTR_SELF_MODIFYING_CODE = 0x04000000
-S_ATTR_DEBUG = 0x02000000
-S_ATTR_SOME_INSTRUCTIONS = 0x00000400
-S_ATTR_EXT_RELOC = 0x00000200
-S_ATTR_LOC_RELOC = 0x00000100
+S_ATTR_PURE_INSTRUCTIONS = SectionAttribute.PURE_INSTRUCTIONS
+S_ATTR_NO_TOC = SectionAttribute.NO_TOC
+S_ATTR_STRIP_STATIC_SYMS = SectionAttribute.STRIP_STATIC_SYMS
+S_ATTR_NO_DEAD_STRIP = SectionAttribute.NO_DEAD_STRIP
+S_ATTR_LIVE_SUPPORT = SectionAttribute.LIVE_SUPPORT
+S_ATTR_SELF_MODIFYING_CODE = SectionAttribute.SELF_MODIFYING_CODE
+S_ATTR_DEBUG = SectionAttribute.DEBUG
+S_ATTR_SOME_INSTRUCTIONS = SectionAttribute.SOME_INSTRUCTIONS
+S_ATTR_EXT_RELOC = SectionAttribute.EXT_RELOC
+S_ATTR_LOC_RELOC = SectionAttribute.LOC_RELOC
+
+# Either instruction attribute marks a section as executable. Kept as a
+# plain int so masking a section's flags stays a C-level int operation.
+S_ATTR_INSTRUCTIONS = int(S_ATTR_PURE_INSTRUCTIONS | S_ATTR_SOME_INSTRUCTIONS)
+
+
+# Precompiled on-disk layouts. Field order matches the dataclasses below,
+# so a layout unpacks straight into the constructor.
+FAT_HEADER_STRUCT = struct.Struct('>2I')
+FAT_ARCH_STRUCT = struct.Struct('>5I')
+MACH_HEADER_STRUCT = struct.Struct('<I2i4I')
+MACH_HEADER64_STRUCT = struct.Struct('<I2i5I')
+LOAD_COMMAND_STRUCT = struct.Struct('<2I')
+SEGMENT_COMMAND_STRUCT = struct.Struct('<2I16s4I2i2I')
+SEGMENT_COMMAND64_STRUCT = struct.Struct('<2I16s4Q2i2I')
+SECTION_STRUCT = struct.Struct('<16s16s9I')
+SECTION64_STRUCT = struct.Struct('<16s16s2Q8I')
+SYMTAB_COMMAND_STRUCT = struct.Struct('<6I')
+NLIST_STRUCT = struct.Struct('<I2BhI')
+NLIST64_STRUCT = struct.Struct('<I2BHQ')
+ENCRYPTION_INFO_STRUCT = struct.Struct('<5I')
+ENCRYPTION_INFO64_STRUCT = struct.Struct('<6I')
+
+
+def _decode_name(raw: bytes) -> str:
+    """Decode a fixed 16-byte, NUL-padded segment/section name.
+
+    Names are interned: a binary has hundreds of sections but only a
+    handful of distinct segment names.
+    """
+    return sys.intern(raw.rstrip(b'\x00').decode('ascii', errors='replace'))
 
 
 @dataclass
@@ -90,6 +203,13 @@ class FatHeader:
     magic: int = 0
     nfat_arch: int = 0
 
+    SIZE = FAT_HEADER_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'FatHeader':
+        """Unpack from a buffer without slicing."""
+        return cls(*FAT_HEADER_STRUCT.unpack_from(buffer, offset))
+
 
 @dataclass
 class FatArch:
@@ -100,6 +220,13 @@ class FatArch:
     size: int = 0
     align: int = 0
 
+    SIZE = FAT_ARCH_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'FatArch':
+        """Unpack from a buffer without slicing."""
+        return cls(*FAT_ARCH_STRUCT.unpack_from(buffer, offset))
+
 
 @dataclass
 class MachHeader:
@@ -112,6 +239,13 @@ class MachHeader:
     sizeofcmds: int = 0
     flags: int = 0
 
+    SIZE = MACH_HEADER_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'MachHeader':
+        """Unpack from a buffer without slicing."""
+        return cls(*MACH_HEADER_STRUCT.unpack_from(buffer, offset))
+
 
 @dataclass
 class MachHeader64:
@@ -125,6 +259,13 @@ class MachHeader64:
     flags: int = 0
     reserved: int = 0
 
+    SIZE = MACH_HEADER64_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'MachHeader64':
+        """Unpack from a buffer without slicing."""
+        return cls(*MACH_HEADER64_STRUCT.unpack_from(buffer, offset))
+
 
 @dataclass
 class LoadCommand:
@@ -132,6 +273,13 @@ class LoadCommand:
     cmd: int = 0
     cmdsize: int = 0
 
+    SIZE = LOAD_COMMAND_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'LoadCommand':
+        """Unpack from a buffer without slicing."""
+        return cls(*LOAD_COMMAND_STRUCT.unpack_from(buffer, offset))
+
 
 @dataclass
 class SegmentCommand:
@@ -148,6 +296,15 @@ class SegmentCommand:
     nsects: int = 0
     flags: int = 0
 
+    SIZE = SEGMENT_COMMAND_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'SegmentCommand':
+        """Unpack from a buffer without slicing."""
+        values = list(SEGMENT_COMMAND_STRUCT.unpack_from(buffer, offset))
+        values[2] = _decode_name(values[2])
+        return cls(*values)
+
 
 @dataclass
 class SegmentCommand64:
@@ -164,8 +321,17 @@ class SegmentCommand64:
     nsects: int = 0
     flags: int = 0
 
+    SIZE = SEGMENT_COMMAND64_STRUCT.size
 
-@dataclass
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'SegmentCommand64':
+        """Unpack from a buffer without slicing."""
+        values = list(SEGMENT_COMMAND64_STRUCT.unpack_from(buffer, offset))
+        values[2] = _decode_name(values[2])
+        return cls(*values)
+
+
+@dataclass(frozen=True, slots=True)
 class MachoSection:
     """32-bit section."""
     sectname: str = ""  # 16 bytes
@@ -180,8 +346,18 @@ class MachoSection:
     reserved1: int = 0
     reserved2: int = 0
 
+    SIZE = SECTION_STRUCT.size
 
-@dataclass
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'MachoSection':
+        """Unpack from a buffer without slicing."""
+        values = list(SECTION_STRUCT.unpack_from(buffer, offset))
+        values[0] = _decode_name(values[0])
+        values[1] = _decode_name(values[1])
+        return cls(*values)
+
+
+@dataclass(frozen=True, slots=True)
 class MachoSection64Bit:
     """64-bit section."""
     sectname: str = ""  # 16 bytes
@@ -197,6 +373,16 @@ class MachoSection64Bit:
     reserved2: int = 0
     reserved3: int = 0
 
+    SIZE = SECTION64_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'MachoSection64Bit':
+        """Unpack from a buffer without slicing."""
+        values = list(SECTION64_STRUCT.unpack_from(buffer, offset))
+        values[0] = _decode_name(values[0])
+        values[1] = _decode_name(values[1])
+        return cls(*values)
+
 
 @dataclass
 class SymtabCommand:
@@ -208,6 +394,13 @@ class SymtabCommand:
     stroff: int = 0
     strsize: int = 0
 
+    SIZE = SYMTAB_COMMAND_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'SymtabCommand':
+        """Unpack from a buffer without slicing."""
+        return cls(*SYMTAB_COMMAND_STRUCT.unpack_from(buffer, offset))
+
 
 @dataclass
 class DysymtabCommand:
@@ -243,6 +436,13 @@ class Nlist:
     n_desc: int = 0   # description
     n_value: int = 0  # value
 
+    SIZE = NLIST_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'Nlist':
+        """Unpack from a buffer without slicing."""
+        return cls(*NLIST_STRUCT.unpack_from(buffer, offset))
+
 
 @dataclass
 class Nlist64:
@@ -253,6 +453,13 @@ class Nlist64:
     n_desc: int = 0
     n_value: int = 0
 
+    SIZE = NLIST64_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'Nlist64':
+        """Unpack from a buffer without slicing."""
+        return cls(*NLIST64_STRUCT.unpack_from(buffer, offset))
+
 
 @dataclass
 class EncryptionInfoCommand:
@@ -263,6 +470,13 @@ class EncryptionInfoCommand:
     cryptsize: int = 0
     cryptid: int = 0
 
+    SIZE = ENCRYPTION_INFO_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'EncryptionInfoCommand':
+        """Unpack from a buffer without slicing."""
+        return cls(*ENCRYPTION_INFO_STRUCT.unpack_from(buffer, offset))
+
 
 @dataclass
 class EncryptionInfoCommand64:
@@ -273,3 +487,10 @@ class EncryptionInfoCommand64:
     cryptsize: int = 0
     cryptid: int = 0
     pad: int = 0
+
+    SIZE = ENCRYPTION_INFO64_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'EncryptionInfoCommand64':
+        """Unpack from a buffer without slicing."""
+        return cls(*ENCRYPTION_INFO64_STRUCT.unpack_from(buffer, offset))
@@ -5,12 +5,18 @@ NSO is the executable format used on Nintendo Switch. The binaries
 are typically compressed with LZ4.
 """
 
-from typing import List, Optional
-from io import BytesIO
+from typing import List, Optional, Tuple, Union
 
 from ..il2cpp.base import Il2Cpp
 from ..search.section_helper import SectionHelper, SearchSection
-from .nso_structures import NsoHeader, NsoSegmentHeader, NSO_MAGIC
+from .nso_structures import (
+    NsoHeader, NsoSegmentHeader, NSO_MAGIC,
+    NSO_COMPRESSED_SIZES_OFFSET, NSO_COMPRESSED_SIZES_STRUCT,
+)
+
+
+def _identity(addr: int) -> int:
+    return addr
 
 
 class NSO(Il2Cpp):
@@ -21,8 +27,6 @@ class NSO(Il2Cpp):
     """
 
     def __init__(self, data: bytes):
-        # First check if we need to decompress
-        self._original_data = data
         self._header: Optional[NsoHeader] = None
 
         # Parse header to check compression flags
@@ -40,131 +44,105 @@ class NSO(Il2Cpp):
         self._data_start = 0
         self._data_end = 0
         self._bss_end = 0
+        self._exec_sections: Tuple[SearchSection, ...] = ()
+        self._data_sections: Tuple[SearchSection, ...] = ()
+        self._bss_sections: Tuple[SearchSection, ...] = ()
         self._load()
 
+        # The decompressed image is laid out at its virtual addresses, so all
+        # three translations are the identity. Binding the plain function on
+        # the instance skips the method lookup on every pointer the loaders map.
+        self.map_vatr = self.map_rtva = self.get_rva = _identity
+
     def _parse_header_only(self, data: bytes) -> None:
         """Parse just the header to check compression flags."""
-        stream = BytesIO(data)
+        # The compressed segment sizes are read from past the end of the header
+        if len(data) < max(NsoHeader.SIZE, NSO_COMPRESSED_SIZES_OFFSET + NSO_COMPRESSED_SIZES_STRUCT.size):
+            raise ValueError("Invalid NSO magic")
 
-        self._header = NsoHeader()
-        self._header.magic = int.from_bytes(stream.read(4), 'little')
+        self._header = NsoHeader.unpack_from(data, 0)
 
         if self._header.magic != NSO_MAGIC:
             raise ValueError("Invalid NSO magic")
 
-        self._header.version = int.from_bytes(stream.read(4), 'little')
-        self._header.reserved = int.from_bytes(stream.read(4), 'little')
-        self._header.flags = int.from_bytes(stream.read(4), 'little')
-
-        # Text segment info
-        self._header.text_file_offset = int.from_bytes(stream.read(4), 'little')
-        self._header.text_memory_offset = int.from_bytes(stream.read(4), 'little')
-        self._header.text_decompressed_size = int.from_bytes(stream.read(4), 'little')
-
-        self._header.module_name_offset = int.from_bytes(stream.read(4), 'little')
-
-        # Rodata segment info
-        self._header.rodata_file_offset = int.from_bytes(stream.read(4), 'little')
-        self._header.rodata_memory_offset = int.from_bytes(stream.read(4), 'little')
-        self._header.rodata_decompressed_size = int.from_bytes(stream.read(4), 'little')
-
-        self._header.module_name_size = int.from_bytes(stream.read(4), 'little')
-
-        # Data segment info
-        self._header.data_file_offset = int.from_bytes(stream.read(4), 'little')
-        self._header.data_memory_offset = int.from_bytes(stream.read(4), 'little')
-        self._header.data_decompressed_size = int.from_bytes(stream.read(4), 'little')
-
-        self._header.bss_size = int.from_bytes(stream.read(4), 'little')
-
-    def _decompress_if_needed(self, data: bytes) -> bytes:
+    def _decompress_if_needed(self, data: bytes) -> Union[bytes, bytearray]:
         """Decompress segments if compression flags are set."""
         if not self._header:
             return data
 
-        flags = self._header.flags
+        header = self._header
+        flags = header.flags
 
         # Flags: bit 0 = .text compressed, bit 1 = .rodata compressed, bit 2 = .data compressed
-        text_compressed = (flags & 1) != 0
-        rodata_compressed = (flags & 2) != 0
-        data_compressed = (flags & 4) != 0
-
-        if not (text_compressed or rodata_compressed or data_compressed):
+        compressed = flags & 7
+
+        # Nothing compressed and every segment already sits at its memory
+        # offset: the file is the image, so hand it through untouched
+        if (not compressed and
+                header.text_file_offset == header.text_memory_offset and
+                header.rodata_file_offset == header.rodata_memory_offset and
+                header.data_file_offset == header.data_memory_offset):
             return data
 
-        # Try to import LZ4
-        try:
-            import lz4.block
-        except ImportError:
-            print("WARNING: LZ4 not available. Install with: pip install lz4")
-            print("Attempting to continue with raw data (may fail)...")
-            return data
+        if compressed:
+            # Try to import LZ4
+            try:
+                import lz4.block
+            except ImportError:
+                print("WARNING: LZ4 not available. Install with: pip install lz4")
+                print("Attempting to continue with raw data (may fail)...")
+                return data
 
         # Build decompressed image
         # We need to read compressed sizes from the extended header
-        stream = BytesIO(data)
-        stream.seek(0x60)  # Skip to segment sizes section
-
-        text_compressed_size = int.from_bytes(stream.read(4), 'little')
-        rodata_compressed_size = int.from_bytes(stream.read(4), 'little')
-        data_compressed_size = int.from_bytes(stream.read(4), 'little')
+        (text_compressed_size,
+         rodata_compressed_size,
+         data_compressed_size) = NSO_COMPRESSED_SIZES_STRUCT.unpack_from(data, NSO_COMPRESSED_SIZES_OFFSET)
 
         # Calculate total decompressed size
-        total_size = (self._header.data_memory_offset +
-                      self._header.data_decompressed_size +
-                      self._header.bss_size)
+        total_size = (header.data_memory_offset +
+                      header.data_decompressed_size +
+                      header.bss_size)
 
         result = bytearray(total_size)
 
-        # Decompress text segment
-        if text_compressed:
-            stream.seek(self._header.text_file_offset)
-            compressed = stream.read(text_compressed_size)
-            decompressed = lz4.block.decompress(
-                compressed,
-                uncompressed_size=self._header.text_decompressed_size
-            )
-            result[self._header.text_memory_offset:
-                   self._header.text_memory_offset + len(decompressed)] = decompressed
-        else:
-            stream.seek(self._header.text_file_offset)
-            raw = stream.read(self._header.text_decompressed_size)
-            result[self._header.text_memory_offset:
-                   self._header.text_memory_offset + len(raw)] = raw
-
-        # Decompress rodata segment
-        if rodata_compressed:
-            stream.seek(self._header.rodata_file_offset)
-            compressed = stream.read(rodata_compressed_size)
-            decompressed = lz4.block.decompress(
-                compressed,
-                uncompressed_size=self._header.rodata_decompressed_size
-            )
-            result[self._header.rodata_memory_offset:
-                   self._header.rodata_memory_offset + len(decompressed)] = decompressed
-        else:
-            stream.seek(self._header.rodata_file_offset)
-            raw = stream.read(self._header.rodata_decompressed_size)
-            result[self._header.rodata_memory_offset:
-                   self._header.rodata_memory_offset + len(raw)] = raw
-
-        # Decompress data segment
-        if data_compressed:
-            stream.seek(self._header.data_file_offset)
-            compressed = stream.read(data_compressed_size)
-            decompressed = lz4.block.decompress(
-                compressed,
-                uncompressed_size=self._header.data_decompressed_size
-            )
-            result[self._header.data_memory_offset:
-                   self._header.data_memory_offset + len(decompressed)] = decompressed
+        # (flag_bit, file_offset, memory_offset, decompressed_size, compressed_size)
+        segments = (
+            (1, header.text_file_offset, header.text_memory_offset,
+             header.text_decompressed_size, text_compressed_size),
+            (2, header.rodata_file_offset, header.rodata_memory_offset,
+             header.rodata_decompressed_size, rodata_compressed_size),
+            (4, header.data_file_offset, header.data_memory_offset,
+             header.data_decompressed_size, data_compressed_size),
+        )
+
+        # Slicing a memoryview keeps raw segments from being copied twice
+        view = memoryview(data)
+
+        def decode_one(segment):
+            flag_bit, file_offset, memory_offset, decompressed_size, compressed_size = segment
+            if flags & flag_bit:
+                src = lz4.block.decompress(view[file_offset:file_offset + compressed_size],
+                                           uncompressed_size=decompressed_size)
+            else:
+                src = view[file_offset:file_offset + decompressed_size]
+            return memory_offset, src
+
+        # lz4.block releases the GIL, so independent segments decompress
+        # concurrently; a single compressed segment isn't worth the pool.
+        if compressed not in (0, 1, 2, 4):
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                results = list(executor.map(decode_one, segments))
         else:
-            stream.seek(self._header.data_file_offset)
-            raw = stream.read(self._header.data_decompressed_size)
-            result[self._header.data_memory_offset:
-                   self._header.data_memory_offset + len(raw)] = raw
+            results = [decode_one(segment) for segment in segments]
 
-        return bytes(result)
+        for memory_offset, payload in results:
+            result[memory_offset:memory_offset + len(payload)] = payload
+
+        # BinaryStream reads a bytearray in place; copying it to bytes would
+        # duplicate the whole image just to drop it again
+        return result
 
     def _load(self) -> None:
         """Load NSO structures."""
@@ -183,6 +161,26 @@ class NSO(Il2Cpp):
 
         self._bss_end = self._data_end + self._header.bss_size
 
+        # Segment bounds are fixed from here on, so the search sections are
+        # built once and shared by every section helper
+        self._exec_sections = (
+            SearchSection(offset=self._text_start, offset_end=self._text_end,
+                          address=self._text_start, address_end=self._text_end),
+        )
+        self._data_sections = (
+            SearchSection(offset=self._rodata_start, offset_end=self._rodata_end,
+                          address=self._rodata_start, address_end=self._rodata_end),
+            SearchSection(offset=self._data_start, offset_end=self._data_end,
+                          address=self._data_start, address_end=self._data_end),
+        )
+        if self._header.bss_size > 0:
+            self._bss_sections = (
+                SearchSection(offset=self._data_end, offset_end=self._bss_end,
+                              address=self._data_end, address_end=self._bss_end),
+            )
+        else:
+            self._bss_sections = self._data_sections
+
     def map_vatr(self, addr: int) -> int:
         """Map virtual address to raw file offset.
 
@@ -190,6 +188,10 @@ class NSO(Il2Cpp):
         """
         return addr
 
+    def _vatr_linear_range(self, addr: int) -> Optional[Tuple[int, int]]:
+        """The whole address space maps to itself."""
+        return 0, 1 << 64
+
     def map_rtva(self, addr: int) -> int:
         """Map raw file offset to virtual address.
 
@@ -214,48 +216,11 @@ class NSO(Il2Cpp):
 
     def get_section_helper(self, method_count: int, type_definitions_count: int, image_count: int) -> SectionHelper:
         """Get section helper for searching."""
-        exec_list = []
-        data_list = []
-        bss_list = []
-
-        # Text section (executable)
-        exec_list.append(SearchSection(
-            offset=self._text_start,
-            offset_end=self._text_end,
-            address=self._text_start,
-            address_end=self._text_end
-        ))
-
-        # Rodata section (data)
-        data_list.append(SearchSection(
-            offset=self._rodata_start,
-            offset_end=self._rodata_end,
-            address=self._rodata_start,
-            address_end=self._rodata_end
-        ))
-
-        # Data section (data)
-        data_list.append(SearchSection(
-            offset=self._data_start,
-            offset_end=self._data_end,
-            address=self._data_start,
-            address_end=self._data_end
-        ))
-
-        # BSS section
-        if self._header and self._header.bss_size > 0:
-            bss_list.append(SearchSection(
-                offset=self._data_end,
-                offset_end=self._bss_end,
-                address=self._data_end,
-                address_end=self._bss_end
-            ))
-
         helper = SectionHelper(self, method_count, type_definitions_count,
                                self._metadata_usages_count, image_count)
-        helper.set_exec_sections(exec_list)
-        helper.set_data_sections(data_list)
-        helper.set_bss_sections(bss_list if bss_list else data_list)
+        helper.set_exec_sections(self._exec_sections)
+        helper.set_data_sections(self._data_sections)
+        helper.set_bss_sections(self._bss_sections)
 
         return helper
 
@@ -2,12 +2,19 @@
 NSO format structure definitions for Nintendo Switch binaries.
 """
 
+import struct
 from dataclasses import dataclass
 
 
 # NSO Magic
 NSO_MAGIC = 0x304F534E  # "NSO0"
 
+# Fixed header layout; field order matches NsoHeader
+NSO_HEADER_STRUCT = struct.Struct('<16I')
+# Compressed segment sizes (text, rodata, data) following the module id
+NSO_COMPRESSED_SIZES_OFFSET = 0x60
+NSO_COMPRESSED_SIZES_STRUCT = struct.Struct('<3I')
+
 
 @dataclass
 class NsoHeader:
@@ -35,6 +42,13 @@ class NsoHeader:
     # BSS size
     bss_size: int = 0
 
+    SIZE = NSO_HEADER_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'NsoHeader':
+        """Unpack from a buffer without slicing."""
+        return cls(*NSO_HEADER_STRUCT.unpack_from(buffer, offset))
+
 
 @dataclass
 class NsoSegmentHeader:
@@ -4,10 +4,13 @@ PE (Portable Executable) format parser for Windows IL2CPP binaries.
 Parses GameAssembly.dll and other Windows IL2CPP binaries.
 """
 
-from typing import List, Optional, Dict
+from bisect import bisect_right
+from typing import List, Optional, Dict, Tuple
 
 from ..il2cpp.base import Il2Cpp
 from ..search.section_helper import SectionHelper, SearchSection
+from ..search.registration_cache import cached_registration
+from .range_index import build_range_index, find_range
 from .pe_structures import (
     ImageDosHeader,
     ImageFileHeader,
@@ -20,13 +23,21 @@ from .pe_structures import (
     IMAGE_NT_SIGNATURE,
     IMAGE_FILE_MACHINE_AMD64,
     IMAGE_FILE_MACHINE_ARM64,
-    IMAGE_SCN_CNT_CODE,
-    IMAGE_SCN_MEM_EXECUTE,
+    IMAGE_SCN_EXECUTABLE,
     IMAGE_SCN_CNT_INITIALIZED_DATA,
     IMAGE_DIRECTORY_ENTRY_EXPORT,
 )
 
 
+# Export names that locate each registration structure. Every name maps to
+# the role it fills, so the export walk does one dict lookup per name however
+# many spellings are listed here.
+_REGISTRATION_EXPORTS: Dict[bytes, str] = {
+    b"g_CodeRegistration": "code",
+    b"g_MetadataRegistration": "metadata",
+}
+
+
 class PE(Il2Cpp):
     """
     PE format parser for Windows IL2CPP binaries.
@@ -54,9 +65,9 @@ class PE(Il2Cpp):
         # Read file header
         self._file_header = self._read_file_header()
 
-        # Determine if 32-bit or 64-bit
-        optional_magic = self.read_uint16()
-        self.position -= 2  # Go back to read full optional header
+        # Determine if 32-bit or 64-bit; the magic is peeked in place since
+        # it is the first field of either optional header
+        optional_magic = self._data[self.position] | (self._data[self.position + 1] << 8)
 
         if optional_magic == 0x20B:  # PE32+
             self.is_32bit = False
@@ -70,176 +81,88 @@ class PE(Il2Cpp):
         # Read section headers
         self._sections = self._read_sections()
 
-        # Build section name lookup
-        self._section_by_name: Dict[str, SectionHeader] = {
-            s.Name: s for s in self._sections
+        # Build section name lookup, keyed by the raw name (e.g. b'.text')
+        self._section_by_name: Dict[bytes, SectionHeader] = {
+            s.RawName: s for s in self._sections
         }
 
+        self._build_address_index()
+
     def _read_dos_header(self) -> ImageDosHeader:
         """Read DOS header."""
-        self.position = 0
-        header = ImageDosHeader()
-        header.e_magic = self.read_uint16()
-        header.e_cblp = self.read_uint16()
-        header.e_cp = self.read_uint16()
-        header.e_crlc = self.read_uint16()
-        header.e_cparhdr = self.read_uint16()
-        header.e_minalloc = self.read_uint16()
-        header.e_maxalloc = self.read_uint16()
-        header.e_ss = self.read_uint16()
-        header.e_sp = self.read_uint16()
-        header.e_csum = self.read_uint16()
-        header.e_ip = self.read_uint16()
-        header.e_cs = self.read_uint16()
-        header.e_lfarlc = self.read_uint16()
-        header.e_ovno = self.read_uint16()
-        header.e_res = self.read_bytes(8)
-        header.e_oemid = self.read_uint16()
-        header.e_oeminfo = self.read_uint16()
-        header.e_res2 = self.read_bytes(20)
-        header.e_lfanew = self.read_uint32()
+        header = ImageDosHeader.unpack_from(self._data, 0)
+        self.position = ImageDosHeader.SIZE
         return header
 
     def _read_file_header(self) -> ImageFileHeader:
         """Read COFF file header."""
-        header = ImageFileHeader()
-        header.Machine = self.read_uint16()
-        header.NumberOfSections = self.read_uint16()
-        header.TimeDateStamp = self.read_uint32()
-        header.PointerToSymbolTable = self.read_uint32()
-        header.NumberOfSymbols = self.read_uint32()
-        header.SizeOfOptionalHeader = self.read_uint16()
-        header.Characteristics = self.read_uint16()
-        return header
+        return self.read_record(ImageFileHeader)
 
     def _read_optional_header32(self) -> ImageOptionalHeader32:
         """Read 32-bit optional header."""
-        header = ImageOptionalHeader32()
-        header.Magic = self.read_uint16()
-        header.MajorLinkerVersion = self.read_byte()
-        header.MinorLinkerVersion = self.read_byte()
-        header.SizeOfCode = self.read_uint32()
-        header.SizeOfInitializedData = self.read_uint32()
-        header.SizeOfUninitializedData = self.read_uint32()
-        header.AddressOfEntryPoint = self.read_uint32()
-        header.BaseOfCode = self.read_uint32()
-        header.BaseOfData = self.read_uint32()
-        header.ImageBase = self.read_uint32()
-        header.SectionAlignment = self.read_uint32()
-        header.FileAlignment = self.read_uint32()
-        header.MajorOperatingSystemVersion = self.read_uint16()
-        header.MinorOperatingSystemVersion = self.read_uint16()
-        header.MajorImageVersion = self.read_uint16()
-        header.MinorImageVersion = self.read_uint16()
-        header.MajorSubsystemVersion = self.read_uint16()
-        header.MinorSubsystemVersion = self.read_uint16()
-        header.Win32VersionValue = self.read_uint32()
-        header.SizeOfImage = self.read_uint32()
-        header.SizeOfHeaders = self.read_uint32()
-        header.CheckSum = self.read_uint32()
-        header.Subsystem = self.read_uint16()
-        header.DllCharacteristics = self.read_uint16()
-        header.SizeOfStackReserve = self.read_uint32()
-        header.SizeOfStackCommit = self.read_uint32()
-        header.SizeOfHeapReserve = self.read_uint32()
-        header.SizeOfHeapCommit = self.read_uint32()
-        header.LoaderFlags = self.read_uint32()
-        header.NumberOfRvaAndSizes = self.read_uint32()
-
-        # Read data directories
-        header.DataDirectory = []
-        for _ in range(min(header.NumberOfRvaAndSizes, 16)):
-            dd = ImageDataDirectory()
-            dd.VirtualAddress = self.read_uint32()
-            dd.Size = self.read_uint32()
-            header.DataDirectory.append(dd)
-
+        header = self.read_record(ImageOptionalHeader32)
+        header.DataDirectory = self._read_data_directories(header.NumberOfRvaAndSizes)
         return header
 
     def _read_optional_header64(self) -> ImageOptionalHeader64:
         """Read 64-bit optional header (PE32+)."""
-        header = ImageOptionalHeader64()
-        header.Magic = self.read_uint16()
-        header.MajorLinkerVersion = self.read_byte()
-        header.MinorLinkerVersion = self.read_byte()
-        header.SizeOfCode = self.read_uint32()
-        header.SizeOfInitializedData = self.read_uint32()
-        header.SizeOfUninitializedData = self.read_uint32()
-        header.AddressOfEntryPoint = self.read_uint32()
-        header.BaseOfCode = self.read_uint32()
-        # Note: No BaseOfData in PE32+
-        header.ImageBase = self.read_uint64()
-        header.SectionAlignment = self.read_uint32()
-        header.FileAlignment = self.read_uint32()
-        header.MajorOperatingSystemVersion = self.read_uint16()
-        header.MinorOperatingSystemVersion = self.read_uint16()
-        header.MajorImageVersion = self.read_uint16()
-        header.MinorImageVersion = self.read_uint16()
-        header.MajorSubsystemVersion = self.read_uint16()
-        header.MinorSubsystemVersion = self.read_uint16()
-        header.Win32VersionValue = self.read_uint32()
-        header.SizeOfImage = self.read_uint32()
-        header.SizeOfHeaders = self.read_uint32()
-        header.CheckSum = self.read_uint32()
-        header.Subsystem = self.read_uint16()
-        header.DllCharacteristics = self.read_uint16()
-        header.SizeOfStackReserve = self.read_uint64()
-        header.SizeOfStackCommit = self.read_uint64()
-        header.SizeOfHeapReserve = self.read_uint64()
-        header.SizeOfHeapCommit = self.read_uint64()
-        header.LoaderFlags = self.read_uint32()
-        header.NumberOfRvaAndSizes = self.read_uint32()
-
-        # Read data directories
-        header.DataDirectory = []
-        for _ in range(min(header.NumberOfRvaAndSizes, 16)):
-            dd = ImageDataDirectory()
-            dd.VirtualAddress = self.read_uint32()
-            dd.Size = self.read_uint32()
-            header.DataDirectory.append(dd)
-
+        header = self.read_record(ImageOptionalHeader64)
+        header.DataDirectory = self._read_data_directories(header.NumberOfRvaAndSizes)
         return header
 
+    def _read_data_directories(self, count: int) -> List[ImageDataDirectory]:
+        """Read the data directories that follow the optional header."""
+        count = min(count, 16)
+        directories = ImageDataDirectory.unpack_array(self._data, self.position, count)
+        self.position += count * ImageDataDirectory.SIZE
+        return directories
+
     def _read_sections(self) -> List[SectionHeader]:
         """Read section headers."""
-        sections = []
-        for _ in range(self._file_header.NumberOfSections):
-            section = SectionHeader()
-            name_bytes = self.read_bytes(8)
-            section.Name = name_bytes.rstrip(b'\x00').decode('ascii', errors='replace')
-            section.VirtualSize = self.read_uint32()
-            section.VirtualAddress = self.read_uint32()
-            section.SizeOfRawData = self.read_uint32()
-            section.PointerToRawData = self.read_uint32()
-            section.PointerToRelocations = self.read_uint32()
-            section.PointerToLinenumbers = self.read_uint32()
-            section.NumberOfRelocations = self.read_uint16()
-            section.NumberOfLinenumbers = self.read_uint16()
-            section.Characteristics = self.read_uint32()
-            sections.append(section)
+        count = self._file_header.NumberOfSections
+        sections = SectionHeader.unpack_array(self._data, self.position, count)
+        self.position += count * SectionHeader.SIZE
         return sections
 
+    def _build_address_index(self) -> None:
+        """Index sections by start address for bisect lookups."""
+        self._va_starts, self._va_ends, self._va_to_raw = build_range_index(
+            (s.VirtualAddress, s.VirtualAddress + s.VirtualSize,
+             s.PointerToRawData - s.VirtualAddress) for s in self._sections)
+        self._raw_starts, self._raw_ends, self._raw_to_va = build_range_index(
+            (s.PointerToRawData, s.PointerToRawData + s.SizeOfRawData,
+             s.VirtualAddress - s.PointerToRawData) for s in self._sections)
+
     def map_vatr(self, addr: int) -> int:
         """Map virtual address to raw file offset."""
         # Handle addresses that include image base
         if addr >= self.image_base:
             addr -= self.image_base
 
-        for section in self._sections:
-            section_start = section.VirtualAddress
-            section_end = section_start + section.VirtualSize
-            if section_start <= addr < section_end:
-                return addr - section.VirtualAddress + section.PointerToRawData
+        i = bisect_right(self._va_starts, addr) - 1
+        if i >= 0 and addr < self._va_ends[i]:
+            return addr + self._va_to_raw[i]
 
         raise ValueError(f"Address 0x{addr:x} not in any section")
 
+    def _vatr_linear_range(self, addr: int) -> Optional[Tuple[int, int]]:
+        """Section run containing addr, in the address space map_vatr() was given."""
+        below_base = addr < self.image_base
+        base = 0 if below_base else self.image_base
+        i = find_range(self._va_starts, self._va_ends, addr - base)
+        if i < 0:
+            return None
+        end = self._va_ends[i] + base
+        # map_vatr() only rebases addresses at or above the image base
+        if below_base:
+            end = min(end, self.image_base)
+        return self._va_starts[i] + base, end
+
     def map_rtva(self, addr: int) -> int:
         """Map raw file offset to virtual address."""
-        for section in self._sections:
-            section_start = section.PointerToRawData
-            section_end = section_start + section.SizeOfRawData
-            if section_start <= addr < section_end:
-                return addr - section.PointerToRawData + section.VirtualAddress + self.image_base
+        i = bisect_right(self._raw_starts, addr) - 1
+        if i >= 0 and addr < self._raw_ends[i]:
+            return addr + self._raw_to_va[i] + self.image_base
 
         return 0
 
@@ -248,6 +171,7 @@ class PE(Il2Cpp):
         # PE files typically use symbol/export search instead
         return False
 
+    @cached_registration
     def plus_search(self, method_count: int, type_definitions_count: int, image_count: int) -> bool:
         """Search using modern algorithm."""
         section_helper = self.get_section_helper(method_count, type_definitions_count, image_count)
@@ -255,6 +179,7 @@ class PE(Il2Cpp):
         metadata_registration = section_helper.find_metadata_registration()
         return self.auto_plus_init(code_registration, metadata_registration)
 
+    @cached_registration
     def symbol_search(self) -> bool:
         """Search using export table."""
         code_registration = 0
@@ -268,44 +193,45 @@ class PE(Il2Cpp):
         if export_dir.VirtualAddress == 0:
             return False
 
+        # Export names are NUL-terminated strings in the image, so if no
+        # spelling of either role is in the raw bytes the walk can't succeed
+        present = {role for name, role in _REGISTRATION_EXPORTS.items()
+                   if self._data.find(name + b'\x00') >= 0}
+        if len(present) < 2:
+            return False
+
         try:
-            self.position = self.map_vatr(export_dir.VirtualAddress)
-            export = ImageExportDirectory()
-            export.Characteristics = self.read_uint32()
-            export.TimeDateStamp = self.read_uint32()
-            export.MajorVersion = self.read_uint16()
-            export.MinorVersion = self.read_uint16()
-            export.Name = self.read_uint32()
-            export.Base = self.read_uint32()
-            export.NumberOfFunctions = self.read_uint32()
-            export.NumberOfNames = self.read_uint32()
-            export.AddressOfFunctions = self.read_uint32()
-            export.AddressOfNames = self.read_uint32()
-            export.AddressOfNameOrdinals = self.read_uint32()
+            export = ImageExportDirectory.unpack_from(self._data, self.map_vatr(export_dir.VirtualAddress))
 
             # Read export names
             names_offset = self.map_vatr(export.AddressOfNames)
             ordinals_offset = self.map_vatr(export.AddressOfNameOrdinals)
             functions_offset = self.map_vatr(export.AddressOfFunctions)
 
-            for i in range(export.NumberOfNames):
-                # Read name RVA
-                self.position = names_offset + i * 4
-                name_rva = self.read_uint32()
-                name = self.read_string_to_null(self.map_vatr(name_rva))
-
-                # Read ordinal
-                self.position = ordinals_offset + i * 2
-                ordinal = self.read_uint16()
+            # Pull the name and ordinal tables in one read each; the function
+            # table is only touched for the two names we care about
+            name_rvas = self.read_uint32_array(names_offset, export.NumberOfNames)
+            ordinals = self.read_uint16_array(ordinals_offset, export.NumberOfNames)
+
+            # Names are compared as raw bytes, so none of them is decoded.
+            # bytes() makes the slice hashable when the image is a bytearray
+            # and returns a bytes slice as-is.
+            data = self._data
+            for name_rva, ordinal in zip(name_rvas, ordinals):
+                start = self.map_vatr(name_rva)
+                end = data.find(b'\x00', start)
+                role = _REGISTRATION_EXPORTS.get(bytes(data[start:end] if end >= 0 else data[start:]))
+                if role is None:
+                    continue
 
-                # Read function RVA
                 self.position = functions_offset + ordinal * 4
-                func_rva = self.read_uint32()
+                if role == "code":
+                    code_registration = self.read_uint32() + self.image_base
+                else:
+                    metadata_registration = self.read_uint32() + self.image_base
 
-                if name == "g_CodeRegistration":
-                    code_registration = func_rva + self.image_base
-                elif name == "g_MetadataRegistration":
-                    metadata_registration = func_rva + self.image_base
+                if code_registration > 0 and metadata_registration > 0:
+                    break
 
             if code_registration > 0 and metadata_registration > 0:
                 print("Detected Symbol!")
@@ -335,12 +261,9 @@ class PE(Il2Cpp):
                 address_end=section.VirtualAddress + section.VirtualSize + self.image_base
             )
 
-            # Check if executable
-            if (section.Characteristics & IMAGE_SCN_CNT_CODE) != 0 or \
-               (section.Characteristics & IMAGE_SCN_MEM_EXECUTE) != 0:
-                exec_list.append(search_section)
-            else:
-                data_list.append(search_section)
+            # Executable sections are searched for code, the rest for data
+            target = exec_list if section.Characteristics & IMAGE_SCN_EXECUTABLE else data_list
+            target.append(search_section)
 
         helper = SectionHelper(self, method_count, type_definitions_count,
                                self._metadata_usages_count, image_count)
@@ -352,11 +275,9 @@ class PE(Il2Cpp):
 
     def check_dump(self) -> bool:
         """Check if this is a memory dump."""
-        # Check if sections are properly aligned
-        for section in self._sections:
-            if section.PointerToRawData != section.VirtualAddress:
-                return False
-        return True
+        # A dump has every section at its virtual address
+        return all(section.PointerToRawData == section.VirtualAddress
+                   for section in self._sections)
 
     def get_rva(self, pointer: int) -> int:
         """Get RVA from virtual address."""
@@ -2,6 +2,7 @@
 PE (Portable Executable) format structures for Windows binaries.
 """
 
+import struct
 from dataclasses import dataclass
 from typing import List
 
@@ -24,6 +25,9 @@ IMAGE_SCN_MEM_EXECUTE = 0x20000000
 IMAGE_SCN_MEM_READ = 0x40000000
 IMAGE_SCN_MEM_WRITE = 0x80000000
 
+# Either flag marks a section as code for registration searches
+IMAGE_SCN_EXECUTABLE = IMAGE_SCN_CNT_CODE | IMAGE_SCN_MEM_EXECUTE
+
 # Data directory indices
 IMAGE_DIRECTORY_ENTRY_EXPORT = 0
 IMAGE_DIRECTORY_ENTRY_IMPORT = 1
@@ -42,7 +46,19 @@ IMAGE_DIRECTORY_ENTRY_DELAY_IMPORT = 13
 IMAGE_DIRECTORY_ENTRY_COM_DESCRIPTOR = 14
 
 
-@dataclass
+# Precompiled on-disk layouts. Field order matches the dataclasses below,
+# so a layout unpacks straight into the constructor.
+# The DOS header's reserved words are padding here; they are never read.
+IMAGE_DOS_HEADER_STRUCT = struct.Struct('<14H8x2H20xI')
+IMAGE_FILE_HEADER_STRUCT = struct.Struct('<2H3I2H')
+IMAGE_DATA_DIRECTORY_STRUCT = struct.Struct('<2I')
+IMAGE_OPTIONAL_HEADER32_STRUCT = struct.Struct('<H2B9I6H4I2H6I')
+IMAGE_OPTIONAL_HEADER64_STRUCT = struct.Struct('<H2B5IQ2I6H4I2H4Q2I')
+SECTION_HEADER_STRUCT = struct.Struct('<8s6I2HI')
+IMAGE_EXPORT_DIRECTORY_STRUCT = struct.Struct('<2I2H7I')
+
+
+@dataclass(slots=True)
 class ImageDosHeader:
     """DOS header (MZ header)."""
     e_magic: int = 0      # Magic number (MZ)
@@ -59,14 +75,22 @@ class ImageDosHeader:
     e_cs: int = 0         # Initial (relative) CS value
     e_lfarlc: int = 0     # File address of relocation table
     e_ovno: int = 0       # Overlay number
-    e_res: bytes = b''    # Reserved words (8 bytes)
+    e_res: bytes = b''    # Reserved words (8 bytes, not unpacked)
     e_oemid: int = 0      # OEM identifier
     e_oeminfo: int = 0    # OEM information
-    e_res2: bytes = b''   # Reserved words (20 bytes)
+    e_res2: bytes = b''   # Reserved words (20 bytes, not unpacked)
     e_lfanew: int = 0     # File address of new exe header
 
+    SIZE = IMAGE_DOS_HEADER_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'ImageDosHeader':
+        """Unpack from a buffer without slicing."""
+        values = IMAGE_DOS_HEADER_STRUCT.unpack_from(buffer, offset)
+        return cls(*values[:14], b'', values[14], values[15], b'', values[16])
+
 
-@dataclass
+@dataclass(slots=True)
 class ImageFileHeader:
     """COFF file header."""
     Machine: int = 0
@@ -77,15 +101,35 @@ class ImageFileHeader:
     SizeOfOptionalHeader: int = 0
     Characteristics: int = 0
 
+    SIZE = IMAGE_FILE_HEADER_STRUCT.size
 
-@dataclass
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'ImageFileHeader':
+        """Unpack from a buffer without slicing."""
+        return cls(*IMAGE_FILE_HEADER_STRUCT.unpack_from(buffer, offset))
+
+
+@dataclass(slots=True)
 class ImageDataDirectory:
     """Data directory entry."""
     VirtualAddress: int = 0
     Size: int = 0
 
+    SIZE = IMAGE_DATA_DIRECTORY_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'ImageDataDirectory':
+        """Unpack from a buffer without slicing."""
+        return cls(*IMAGE_DATA_DIRECTORY_STRUCT.unpack_from(buffer, offset))
+
+    @classmethod
+    def unpack_array(cls, buffer, offset: int, count: int) -> List['ImageDataDirectory']:
+        """Unpack a contiguous table of data directories in one pass."""
+        table = buffer[offset:offset + count * IMAGE_DATA_DIRECTORY_STRUCT.size]
+        return [cls(va, size) for va, size in IMAGE_DATA_DIRECTORY_STRUCT.iter_unpack(table)]
+
 
-@dataclass
+@dataclass(slots=True)
 class ImageOptionalHeader32:
     """Optional header for 32-bit PE."""
     Magic: int = 0
@@ -120,8 +164,15 @@ class ImageOptionalHeader32:
     NumberOfRvaAndSizes: int = 0
     DataDirectory: List[ImageDataDirectory] = None
 
+    SIZE = IMAGE_OPTIONAL_HEADER32_STRUCT.size
 
-@dataclass
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'ImageOptionalHeader32':
+        """Unpack from a buffer without slicing."""
+        return cls(*IMAGE_OPTIONAL_HEADER32_STRUCT.unpack_from(buffer, offset))
+
+
+@dataclass(slots=True)
 class ImageOptionalHeader64:
     """Optional header for 64-bit PE (PE32+)."""
     Magic: int = 0
@@ -156,11 +207,18 @@ class ImageOptionalHeader64:
     NumberOfRvaAndSizes: int = 0
     DataDirectory: List[ImageDataDirectory] = None
 
+    SIZE = IMAGE_OPTIONAL_HEADER64_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'ImageOptionalHeader64':
+        """Unpack from a buffer without slicing."""
+        return cls(*IMAGE_OPTIONAL_HEADER64_STRUCT.unpack_from(buffer, offset))
 
-@dataclass
+
+@dataclass(slots=True)
 class SectionHeader:
     """Section header."""
-    Name: str = ""
+    RawName: bytes = b''  # NUL padding stripped; see Name
     VirtualSize: int = 0
     VirtualAddress: int = 0
     SizeOfRawData: int = 0
@@ -171,8 +229,29 @@ class SectionHeader:
     NumberOfLinenumbers: int = 0
     Characteristics: int = 0
 
+    SIZE = SECTION_HEADER_STRUCT.size
+
+    @property
+    def Name(self) -> str:
+        """Section name, decoded on demand."""
+        return self.RawName.decode('ascii', errors='replace')
 
-@dataclass
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'SectionHeader':
+        """Unpack from a buffer without slicing."""
+        values = list(SECTION_HEADER_STRUCT.unpack_from(buffer, offset))
+        values[0] = values[0].rstrip(b'\x00')
+        return cls(*values)
+
+    @classmethod
+    def unpack_array(cls, buffer, offset: int, count: int) -> List['SectionHeader']:
+        """Unpack a contiguous table of section headers in one pass."""
+        table = buffer[offset:offset + count * SECTION_HEADER_STRUCT.size]
+        return [cls(name.rstrip(b'\x00'), *values)
+                for name, *values in SECTION_HEADER_STRUCT.iter_unpack(table)]
+
+
+@dataclass(slots=True)
 class ImageExportDirectory:
     """Export directory."""
     Characteristics: int = 0
@@ -186,3 +265,10 @@ class ImageExportDirectory:
     AddressOfFunctions: int = 0
     AddressOfNames: int = 0
     AddressOfNameOrdinals: int = 0
+
+    SIZE = IMAGE_EXPORT_DIRECTORY_STRUCT.size
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'ImageExportDirectory':
+        """Unpack from a buffer without slicing."""
+        return cls(*IMAGE_EXPORT_DIRECTORY_STRUCT.unpack_from(buffer, offset))
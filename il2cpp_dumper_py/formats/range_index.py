@@ -0,0 +1,59 @@
+"""
+Address range index shared by the container formats.
+
+Formats that map addresses through a table of (start, end, delta) ranges
+flatten the table once here and bisect it on every lookup.
+"""
+
+import heapq
+from bisect import bisect_right
+from typing import Iterable, List, Tuple
+
+
+def build_range_index(ranges: Iterable[Tuple[int, int, int]]) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Flatten (start, end, delta) ranges into sorted, disjoint runs.
+
+    Ranges may overlap (WASM passive segments all sit at offset 0, PE
+    sections can be malformed), so each run keeps the delta of the earliest
+    range covering it, which is the answer a linear scan in the original
+    order would give. Empty ranges never match. Returns parallel
+    (starts, ends, deltas) lists for bisect lookups.
+    """
+    ranges = [(start, end, index, delta)
+              for index, (start, end, delta) in enumerate(ranges) if end > start]
+    ranges.sort()
+    bounds = sorted({r[0] for r in ranges} | {r[1] for r in ranges})
+
+    starts: List[int] = []
+    ends: List[int] = []
+    deltas: List[int] = []
+    active: List[Tuple[int, int, int]] = []  # heap of (index, end, delta)
+    next_range = 0
+    for lo, hi in zip(bounds, bounds[1:]):
+        while next_range < len(ranges) and ranges[next_range][0] == lo:
+            _, end, index, delta = ranges[next_range]
+            heapq.heappush(active, (index, end, delta))
+            next_range += 1
+        while active and active[0][1] <= lo:
+            heapq.heappop(active)
+        if not active:
+            continue
+
+        delta = active[0][2]
+        if ends and ends[-1] == lo and deltas[-1] == delta:
+            ends[-1] = hi
+        else:
+            starts.append(lo)
+            ends.append(hi)
+            deltas.append(delta)
+
+    return starts, ends, deltas
+
+
+def find_range(starts: List[int], ends: List[int], addr: int) -> int:
+    """Index of the run containing addr, or -1 if no run does."""
+    i = bisect_right(starts, addr) - 1
+    if i >= 0 and addr < ends[i]:
+        return i
+    return -1
@@ -5,17 +5,49 @@ WebAssembly is used for Unity WebGL builds. The IL2CPP binary is compiled
 to WebAssembly and runs in web browsers.
 """
 
-from typing import List, Optional
-from io import BytesIO
+from bisect import bisect_right
+from typing import List, Optional, Tuple
 
 from ..il2cpp.base import Il2Cpp
 from ..search.section_helper import SectionHelper, SearchSection
+from .range_index import build_range_index, find_range
 from .wasm_structures import (
     WasmSection, WasmDataSegment,
     WASM_MAGIC, WASM_VERSION, WasmSectionId
 )
 
 
+def _decode_uleb128(buf, pos: int) -> Tuple[int, int]:
+    """Decode an unsigned LEB128 integer at pos, returning (value, next_pos)."""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _decode_sleb128(buf, pos: int) -> Tuple[int, int]:
+    """Decode a signed LEB128 integer at pos, returning (value, next_pos)."""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            break
+
+    if shift < 64 and (byte & 0x40) != 0:
+        result |= (~0 << shift)
+
+    return result, pos
+
+
 class WebAssembly(Il2Cpp):
     """
     WebAssembly format parser for IL2CPP WebGL binaries.
@@ -44,48 +76,38 @@ class WebAssembly(Il2Cpp):
         if version != WASM_VERSION:
             raise ValueError(f"Unsupported WebAssembly version: {version}")
 
-        # Parse sections
-        while self.position < len(self._data):
-            section = self._read_section()
-            if section is None:
-                break
+        # Parse sections. Only the section headers are decoded here: payloads
+        # are skipped by offset, so pages we never need are never touched
+        # (custom section names are left to _read_section)
+        buf = self._data
+        pos = self.position
+        end = len(buf)
+        while pos < end:
+            section_id = buf[pos]
+            size, offset = _decode_uleb128(buf, pos + 1)
+            pos = offset + size
+
+            section = WasmSection(id=section_id, size=size, offset=offset)
             self._sections.append(section)
 
-            if section.id == WasmSectionId.CODE:
+            if section_id == WasmSectionId.CODE:
                 self._code_section = section
-            elif section.id == WasmSectionId.DATA:
+            elif section_id == WasmSectionId.DATA:
                 self._data_section = section
                 self._parse_data_section(section)
 
+        self.position = pos
+        self._build_address_index()
+
     def _read_leb128_unsigned(self) -> int:
         """Read unsigned LEB128 encoded integer."""
-        result = 0
-        shift = 0
-        while True:
-            byte = self.read_byte()
-            result |= (byte & 0x7F) << shift
-            if (byte & 0x80) == 0:
-                break
-            shift += 7
-        return result
+        value, self.position = _decode_uleb128(self._data, self.position)
+        return value
 
     def _read_leb128_signed(self) -> int:
         """Read signed LEB128 encoded integer."""
-        result = 0
-        shift = 0
-        size = 64  # Maximum number of bits
-        byte = 0
-        while True:
-            byte = self.read_byte()
-            result |= (byte & 0x7F) << shift
-            shift += 7
-            if (byte & 0x80) == 0:
-                break
-
-        if shift < size and (byte & 0x40) != 0:
-            result |= (~0 << shift)
-
-        return result
+        value, self.position = _decode_sleb128(self._data, self.position)
+        return value
 
     def _read_section(self) -> Optional[WasmSection]:
         """Read a WebAssembly section."""
@@ -113,45 +135,56 @@ class WebAssembly(Il2Cpp):
 
     def _parse_data_section(self, section: WasmSection) -> None:
         """Parse the data section to find data segments."""
-        saved_pos = self.position
-        self.position = section.offset
+        # Decode straight off the buffer with a local cursor; the stream
+        # position is left where the section walk had it
+        buf = self._data
+        pos = section.offset
 
-        num_segments = self._read_leb128_unsigned()
+        num_segments, pos = _decode_uleb128(buf, pos)
 
         for _ in range(num_segments):
             segment = WasmDataSegment()
 
             # Read segment type (flags)
-            flags = self._read_leb128_unsigned()
+            flags, pos = _decode_uleb128(buf, pos)
 
             if flags == 0:
                 # Active segment with memory index 0
                 segment.memory_index = 0
                 # Read init expression (i32.const followed by offset)
-                opcode = self.read_byte()
+                opcode = buf[pos]
+                pos += 1
                 if opcode == 0x41:  # i32.const
-                    segment.offset = self._read_leb128_signed()
-                end = self.read_byte()  # Should be 0x0B (end)
+                    segment.offset, pos = _decode_sleb128(buf, pos)
+                pos += 1  # Should be 0x0B (end)
             elif flags == 1:
                 # Passive segment
                 segment.memory_index = 0
                 segment.offset = 0
             elif flags == 2:
                 # Active segment with explicit memory index
-                segment.memory_index = self._read_leb128_unsigned()
-                opcode = self.read_byte()
+                segment.memory_index, pos = _decode_uleb128(buf, pos)
+                opcode = buf[pos]
+                pos += 1
                 if opcode == 0x41:
-                    segment.offset = self._read_leb128_signed()
-                end = self.read_byte()
+                    segment.offset, pos = _decode_sleb128(buf, pos)
+                pos += 1
 
             # Read data
-            segment.size = self._read_leb128_unsigned()
-            segment.data_offset = self.position
-            self.position += segment.size
+            segment.size, pos = _decode_uleb128(buf, pos)
+            segment.data_offset = pos
+            pos += segment.size
 
             self._data_segments.append(segment)
 
-        self.position = saved_pos
+    def _build_address_index(self) -> None:
+        """Index data segments by start address for bisect lookups."""
+        self._va_starts, self._va_ends, self._va_to_raw = build_range_index(
+            (s.offset, s.offset + s.size, s.data_offset - s.offset)
+            for s in self._data_segments)
+        self._raw_starts, self._raw_ends, self._raw_to_va = build_range_index(
+            (s.data_offset, s.data_offset + s.size, s.offset - s.data_offset)
+            for s in self._data_segments)
 
     def map_vatr(self, addr: int) -> int:
         """Map virtual address to raw file offset.
@@ -159,18 +192,28 @@ class WebAssembly(Il2Cpp):
         For WebAssembly, addresses are linear memory offsets.
         We search data segments to find where data is stored.
         """
-        for segment in self._data_segments:
-            if segment.offset <= addr < segment.offset + segment.size:
-                return segment.data_offset + (addr - segment.offset)
+        i = bisect_right(self._va_starts, addr) - 1
+        if i >= 0 and addr < self._va_ends[i]:
+            return addr + self._va_to_raw[i]
 
         # If not in data segments, address might be direct
         return addr
 
+    def _vatr_linear_range(self, addr: int) -> Optional[Tuple[int, int]]:
+        """Data segment run containing addr, or the identity-mapped gap around it."""
+        i = find_range(self._va_starts, self._va_ends, addr)
+        if i >= 0:
+            return self._va_starts[i], self._va_ends[i]
+        after = bisect_right(self._va_starts, addr)
+        start = self._va_ends[after - 1] if after else 0
+        end = self._va_starts[after] if after < len(self._va_starts) else 1 << 64
+        return start, end
+
     def map_rtva(self, addr: int) -> int:
         """Map raw file offset to virtual address."""
-        for segment in self._data_segments:
-            if segment.data_offset <= addr < segment.data_offset + segment.size:
-                return segment.offset + (addr - segment.data_offset)
+        i = bisect_right(self._raw_starts, addr) - 1
+        if i >= 0 and addr < self._raw_ends[i]:
+            return addr + self._raw_to_va[i]
         return addr
 
     def search(self) -> bool:
@@ -28,7 +28,7 @@ class WasmSectionId(IntEnum):
     DATA_COUNT = 12
 
 
-@dataclass
+@dataclass(slots=True)
 class WasmSection:
     """WebAssembly section."""
     id: int = 0
@@ -37,7 +37,7 @@ class WasmSection:
     name: str = ""   # For custom sections
 
 
-@dataclass
+@dataclass(slots=True)
 class WasmDataSegment:
     """WebAssembly data segment."""
     memory_index: int = 0
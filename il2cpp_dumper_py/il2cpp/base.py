@@ -4,11 +4,13 @@ Abstract base class for IL2CPP binary parsing.
 This module defines the interface that all executable format parsers must implement.
 """
 
+import array
+import os
+import struct
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple, Type, TypeVar, Any
-from io import BytesIO
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar, Any, Union
 
-from ..io.binary_stream import BinaryStream
+from ..io.binary_stream import BinaryStream, map_file
 from .structures import (
     Il2CppCodeRegistration,
     Il2CppMetadataRegistration,
@@ -18,11 +20,32 @@ from .structures import (
     Il2CppGenericMethodFunctionsDefinitions,
     Il2CppCodeGenModule,
     Il2CppRGCTXDefinition,
-    Il2CppTokenRangePair,
 )
 
 T = TypeVar('T')
 
+# Per-type field offset entry: int32
+_INT32_STRUCT = struct.Struct('<i')
+
+# Il2CppType record: ulong datapoint + uint bits (12 bytes)
+_IL2CPP_TYPE_STRUCT = struct.Struct('<QI')
+
+# Il2CppTokenRangePair record: int token + Il2CppRange (int start, int length)
+_TOKEN_RANGE_PAIR_STRUCT = struct.Struct('<3i')
+
+
+# Version refinements read off a freshly loaded CodeRegistration:
+# version -> (field, test on the field's value, refined version)
+_REGISTRATION_VERSION_RULES: Dict[float, Tuple[str, Callable[[int], bool], float]] = {
+    27: ('invoker_pointers_count', lambda count: count > 0x50000, 27.1),
+    24.4: ('invoker_pointers_count', lambda count: count > 0x50000, 24.5),
+    24.2: ('code_gen_modules', lambda pointer: pointer == 0, 24.3),
+}
+
+# Granularity of the address translation cache (4 KiB pages)
+_VATR_PAGE_SHIFT = 12
+_VATR_PAGE_MASK = (1 << _VATR_PAGE_SHIFT) - 1
+
 
 class Il2Cpp(BinaryStream, ABC):
     """
@@ -53,43 +76,73 @@ class Il2Cpp(BinaryStream, ABC):
         """Initialize the IL2CPP parser."""
         super().__init__(data)
 
+        self._reset_loaded_state()
+
+        # State flags
+        self.is_dumped: bool = False
+        self._metadata_usages_count: int = 0
+
+        # Search result bookkeeping (see search.registration_cache)
+        self._sha256: Optional[str] = None
+        self._init_registration: Optional[Tuple[int, int, float]] = None
+        self.use_search_cache: bool = True
+
+    def _reset_loaded_state(self) -> None:
+        """Empty everything init() reads out of the binary."""
         # Registration structures
         self._code_registration: Optional[Il2CppCodeRegistration] = None
         self._metadata_registration: Optional[Il2CppMetadataRegistration] = None
 
         # Method and type data
         self.method_pointers: List[int] = []
-        self.generic_method_pointers: List[int] = []
-        self.invoker_pointers: List[int] = []
-        self.custom_attribute_generators: List[int] = []
-        self.reverse_pinvoke_wrappers: List[int] = []
-        self.unresolved_virtual_call_pointers: List[int] = []
+        self.generic_method_pointers: Sequence[int] = []
+        self.invoker_pointers: Sequence[int] = []
+        self.custom_attribute_generators: Sequence[int] = []
+        self.reverse_pinvoke_wrappers: Sequence[int] = []
+        self.unresolved_virtual_call_pointers: Sequence[int] = []
 
         # Type data
         self.types: List[Il2CppType] = []
-        self._type_dic: Dict[int, Il2CppType] = {}
-        self.metadata_usages: List[int] = []
+        self._type_index_by_ptr: Dict[int, int] = {}
+        # Single-entry cache for get_il2cpp_type; callers resolving a type's
+        # element or generic class tend to ask for the same pointer repeatedly
+        self._last_type_ptr: int = -1
+        self._last_type: Optional[Il2CppType] = None
+        self.metadata_usages: Sequence[int] = []
 
         # Field offsets
-        self._field_offsets: List[int] = []
+        self._field_offsets: Sequence[int] = []
         self._field_offsets_are_pointers: bool = False
+        self._value_type_header_size: int = 16  # Il2CppObject header, set in _load_types
 
         # Generic data
-        self.generic_inst_pointers: List[int] = []
+        self.generic_inst_pointers: Sequence[int] = []
         self.generic_insts: List[Il2CppGenericInst] = []
         self._generic_method_table: List[Il2CppGenericMethodFunctionsDefinitions] = []
-        self.method_specs: List[Il2CppMethodSpec] = []
-        self.method_definition_method_specs: Dict[int, List[Il2CppMethodSpec]] = {}
-        self.method_spec_generic_method_pointers: Dict[int, int] = {}
+        self.method_specs: Sequence[Il2CppMethodSpec] = []
+        # Method spec indices per method definition, and the generic method
+        # pointer of each method spec (0 if it has none)
+        self.method_definition_method_specs: Dict[int, List[int]] = {}
+        self.method_spec_generic_method_pointers: Sequence[int] = []
 
         # Code gen modules (v24.2+)
         self.code_gen_modules: Dict[str, Il2CppCodeGenModule] = {}
-        self.code_gen_module_method_pointers: Dict[str, List[int]] = {}
+        self.code_gen_module_method_pointers: Dict[str, Sequence[int]] = {}
         self.rgctxs_dictionary: Dict[str, Dict[int, List[Il2CppRGCTXDefinition]]] = {}
 
-        # State flags
-        self.is_dumped: bool = False
-        self._metadata_usages_count: int = 0
+        # Translation delta per page, or None if the page isn't mapped linearly
+        self._vatr_page_cache: Dict[int, Optional[int]] = {}
+
+    @classmethod
+    def from_path(cls, path: Union[str, os.PathLike]) -> 'Il2Cpp':
+        """
+        Open a binary from disk without reading it into memory.
+
+        The file is memory-mapped read-only, so only the pages the parser
+        touches are loaded. Formats that patch the image (e.g. ELF
+        relocations) take a private copy on first write.
+        """
+        return cls(map_file(path))
 
     # ========== Abstract Methods ==========
 
@@ -203,6 +256,11 @@ class Il2Cpp(BinaryStream, ABC):
             code_registration: Address of Il2CppCodeRegistration
             metadata_registration: Address of Il2CppMetadataRegistration
         """
+        # A cached registration that failed part-way through init() leaves
+        # its tables behind; start the real search from a clean slate
+        self._reset_loaded_state()
+        self._init_registration = (code_registration, metadata_registration, self.version)
+
         # Read registration structures
         self._code_registration = self.map_vatr_class(Il2CppCodeRegistration, code_registration)
 
@@ -211,6 +269,12 @@ class Il2Cpp(BinaryStream, ABC):
 
         self._metadata_registration = self.map_vatr_class(Il2CppMetadataRegistration, metadata_registration)
 
+        # The loaders run one after another on purpose. They share the stream
+        # cursor (read_class, read_string_to_null), _load_generics needs the
+        # generic method pointers from _load_pointers, and what's left of each
+        # loader is Python object construction, which holds the GIL, so
+        # threads would only add contention.
+
         # Read pointer arrays
         self._load_pointers()
 
@@ -226,21 +290,13 @@ class Il2Cpp(BinaryStream, ABC):
 
     def _detect_version_from_registration(self, code_registration: int) -> None:
         """Detect version based on registration structure values."""
-        cr = self._code_registration
-        limit = 0x50000
-
-        if self.version == 27 and cr.invoker_pointers_count > limit:
-            self.version = 27.1
-            print(f"Change il2cpp version to: {self.version}")
-            self._code_registration = self.map_vatr_class(Il2CppCodeRegistration, code_registration)
-
-        if self.version == 24.4 and cr.invoker_pointers_count > limit:
-            self.version = 24.5
-            print(f"Change il2cpp version to: {self.version}")
-            self._code_registration = self.map_vatr_class(Il2CppCodeRegistration, code_registration)
+        rule = _REGISTRATION_VERSION_RULES.get(self.version)
+        if rule is None:
+            return
 
-        if self.version == 24.2 and cr.code_gen_modules == 0:
-            self.version = 24.3
+        field_name, matches, refined_version = rule
+        if matches(getattr(self._code_registration, field_name)):
+            self.version = refined_version
             print(f"Change il2cpp version to: {self.version}")
             self._code_registration = self.map_vatr_class(Il2CppCodeRegistration, code_registration)
 
@@ -251,37 +307,37 @@ class Il2Cpp(BinaryStream, ABC):
 
         # Generic method pointers
         if cr.generic_method_pointers_count > 0:
-            self.generic_method_pointers = self.map_vatr_array(
+            self.generic_method_pointers = self.map_vatr_ptr_table(
                 cr.generic_method_pointers, cr.generic_method_pointers_count
             )
 
         # Invoker pointers
         if cr.invoker_pointers_count > 0:
-            self.invoker_pointers = self.map_vatr_array(
+            self.invoker_pointers = self.map_vatr_ptr_table(
                 cr.invoker_pointers, cr.invoker_pointers_count
             )
 
         # Custom attribute generators (v < 27)
         if self.version < 27 and cr.custom_attribute_count > 0:
-            self.custom_attribute_generators = self.map_vatr_array(
+            self.custom_attribute_generators = self.map_vatr_ptr_table(
                 cr.custom_attribute_generators, cr.custom_attribute_count
             )
 
         # Metadata usages (v17-26)
         if 16 < self.version < 27 and self._metadata_usages_count > 0:
-            self.metadata_usages = self.map_vatr_array(
+            self.metadata_usages = self.map_vatr_ptr_table(
                 mr.metadata_usages, self._metadata_usages_count
             )
 
         # Reverse P/Invoke wrappers (v22+)
         if self.version >= 22 and cr.reverse_pinvoke_wrapper_count > 0:
-            self.reverse_pinvoke_wrappers = self.map_vatr_array(
+            self.reverse_pinvoke_wrappers = self.map_vatr_ptr_table(
                 cr.reverse_pinvoke_wrappers, cr.reverse_pinvoke_wrapper_count
             )
 
         # Unresolved virtual calls (v22+)
         if self.version >= 22 and cr.unresolved_virtual_call_count > 0:
-            self.unresolved_virtual_call_pointers = self.map_vatr_array(
+            self.unresolved_virtual_call_pointers = self.map_vatr_ptr_table(
                 cr.unresolved_virtual_call_pointers, cr.unresolved_virtual_call_count
             )
 
@@ -290,32 +346,21 @@ class Il2Cpp(BinaryStream, ABC):
         mr = self._metadata_registration
 
         # Read type pointers
-        type_pointers = self.map_vatr_array(mr.types, mr.types_count)
-
-        # Read all types at once using batch reading
-        # Il2CppType is 12 bytes: ulong (8) + uint (4)
-        self.types = []
-        type_data_list = []
-
-        # Batch read raw data for all types
-        for ptr in type_pointers:
-            offset = self.map_vatr(ptr)
-            self.position = offset
-            data = self.read_bytes(12)
-            type_data_list.append((ptr, data))
-
-        # Parse all types
-        import struct
-        for ptr, data in type_data_list:
-            datapoint, bits = struct.unpack('<QI', data)
-            il2cpp_type = Il2CppType()
-            il2cpp_type.datapoint = datapoint
-            il2cpp_type.bits = bits
-            il2cpp_type.init(self.version)
-            self.types.append(il2cpp_type)
-            self._type_dic[ptr] = il2cpp_type
+        type_pointers = self.map_vatr_ptr_table(mr.types, mr.types_count)
+
+        # Map every pointer once, then unpack the records in contiguous runs
+        offsets = self._map_vatr_many(type_pointers)
+        records = self._bulk_unpack(offsets, _IL2CPP_TYPE_STRUCT)
+
+        # Build the list in one pass; a pointer listed twice keeps its last type.
+        # Each type holds only its raw (datapoint, bits) record; the bit fields
+        # are decoded by the getters of the version's Il2CppType class.
+        self.types = Il2CppType.from_raw_table(map(records.__getitem__, offsets), self.version)
+        self._type_index_by_ptr.update(zip(type_pointers, range(len(type_pointers))))
+        self._last_type_ptr = -1
 
         # Field offsets
+        self._value_type_header_size = 8 if self.is_32bit else 16
         self._field_offsets_are_pointers = self.version > 21
         if self.version == 21:
             # Heuristic check
@@ -326,86 +371,109 @@ class Il2Cpp(BinaryStream, ABC):
             )
 
         if self._field_offsets_are_pointers:
-            self._field_offsets = self.map_vatr_array(mr.field_offsets, mr.field_offsets_count)
+            self._field_offsets = self.map_vatr_ptr_table(mr.field_offsets, mr.field_offsets_count)
         else:
-            self._field_offsets = list(self.map_vatr_uint32_array(mr.field_offsets, mr.field_offsets_count))
+            self._field_offsets = self.read_table('I', self._map_vatr_cached(mr.field_offsets),
+                                                  mr.field_offsets_count)
+
+    def _bulk_unpack(self, offsets: List[int], layout: struct.Struct) -> Dict[int, Tuple]:
+        """
+        Unpack fixed-size records at the given file offsets.
+
+        Records are usually laid out back to back, so sorted offsets form long
+        runs that are each unpacked with a single iter_unpack over one slice.
+        Returns a map of offset -> unpacked record.
+        """
+        size = layout.size
+        records: Dict[int, Tuple] = {}
+        update = records.update
+        unpack_records = self.unpack_records
+
+        run_start = run_end = -1
+        for offset in sorted(set(offsets)):
+            if offset != run_end:
+                if run_start >= 0:
+                    update(zip(range(run_start, run_end, size), unpack_records(
+                        layout, run_start, (run_end - run_start) // size)))
+                run_start = offset
+            run_end = offset + size
+        if run_start >= 0:
+            update(zip(range(run_start, run_end, size), unpack_records(
+                layout, run_start, (run_end - run_start) // size)))
+
+        return records
 
     def _load_generics(self) -> None:
         """Load generic type and method data."""
-        import struct as st
         mr = self._metadata_registration
 
         # Generic instances - batch read
-        self.generic_inst_pointers = self.map_vatr_array(mr.generic_insts, mr.generic_insts_count)
-
-        # Il2CppGenericInst is 16 bytes (2 pointers)
-        self.generic_insts = []
-        for ptr in self.generic_inst_pointers:
-            offset = self.map_vatr(ptr)
-            self.position = offset
-            data = self.read_bytes(16)
-            type_argc, type_argv = st.unpack('<QQ', data)
-            gi = Il2CppGenericInst()
-            gi.type_argc = type_argc
-            gi.type_argv = type_argv
-            self.generic_insts.append(gi)
-
-        # Generic method table - use fast batch reading
-        self.position = self.map_vatr(mr.generic_method_table)
+        self.generic_inst_pointers = self.map_vatr_ptr_table(mr.generic_insts, mr.generic_insts_count)
+
+        # Il2CppGenericInst records use the cached class layout, unpacked in contiguous runs
+        offsets = self._map_vatr_many(self.generic_inst_pointers)
+        records = self._bulk_unpack(offsets, self._get_record_layout(Il2CppGenericInst)[0])
+
+        self.generic_insts = [Il2CppGenericInst(*records[offset]) for offset in offsets]
+
+        # Generic method table - flat records, so one batch unpack
+        self.position = self._map_vatr_cached(mr.generic_method_table)
         self._generic_method_table = self.read_class_array_fast(
             Il2CppGenericMethodFunctionsDefinitions,
             count=mr.generic_method_table_count
         )
 
-        # Method specs - batch read (12 bytes each: 3 x int32)
-        self.position = self.map_vatr(mr.method_specs)
-        if mr.method_specs_count > 0:
-            data = self.read_bytes(mr.method_specs_count * 12)
-            self.method_specs = []
-            for i in range(mr.method_specs_count):
-                offset = i * 12
-                values = st.unpack('<iii', data[offset:offset + 12])
-                ms = Il2CppMethodSpec()
-                ms.method_definition_index = values[0]
-                ms.class_index_index = values[1]
-                ms.method_index_index = values[2]
-                self.method_specs.append(ms)
-        else:
-            self.method_specs = []
+        # Method specs are only decoded when the dump asks for one; the
+        # lookup below just needs their method definition column
+        self.method_specs = self.read_record_table(
+            Il2CppMethodSpec,
+            self._map_vatr_cached(mr.method_specs),
+            mr.method_specs_count
+        )
 
-        # Build method spec lookup
+        # Build method spec lookup, keyed and valued by method spec index.
+        # Everything the loop touches is bound to a local up front, so each
+        # table entry costs a few integer operations and one dict probe.
+        method_definitions = self.method_specs.column('method_definition_index')
+        group = self.method_definition_method_specs.setdefault
+        spec_pointers = self.method_spec_generic_method_pointers = array.array('Q', [0]) * len(method_definitions)
+        generic_method_pointers = self.generic_method_pointers
+        pointer_count = len(generic_method_pointers)
         for table in self._generic_method_table:
-            method_spec = self.method_specs[table.generic_method_index]
-            method_def_index = method_spec.method_definition_index
-
-            if method_def_index not in self.method_definition_method_specs:
-                self.method_definition_method_specs[method_def_index] = []
-
-            self.method_definition_method_specs[method_def_index].append(method_spec)
+            spec_index = table.generic_method_index
+            group(method_definitions[spec_index], []).append(spec_index)
 
             # Map to generic method pointer
-            if table.indices and len(self.generic_method_pointers) > table.indices.method_index:
-                self.method_spec_generic_method_pointers[id(method_spec)] = \
-                    self.generic_method_pointers[table.indices.method_index]
+            method_index = table.method_index
+            if method_index < pointer_count:
+                spec_pointers[spec_index] = generic_method_pointers[method_index]
 
     def _load_code_gen_modules(self) -> None:
         """Load code generation modules (v24.2+)."""
         cr = self._code_registration
 
-        module_pointers = self.map_vatr_array(cr.code_gen_modules, cr.code_gen_modules_count)
-
-        for ptr in module_pointers:
-            module = self.map_vatr_class(Il2CppCodeGenModule, ptr)
-            module_name = self.read_string_to_null(self.map_vatr(module.module_name))
-
+        module_pointers = self.map_vatr_ptr_table(cr.code_gen_modules, cr.code_gen_modules_count)
+
+        # Read every module header first, then every name. Each pass maps
+        # its pointers in one batch, and the headers go through the reader
+        # compiled for this version with nothing looked up per module.
+        read_module = self._get_record_reader(Il2CppCodeGenModule)
+        data = self._data
+        headers = [read_module(data, offset)[0] for offset in self._map_vatr_many(module_pointers)]
+        read_name = self.read_string_to_null
+        modules = [(read_name(offset), module) for offset, module in
+                   zip(self._map_vatr_many(module.module_name for module in headers), headers)]
+
+        # Then pull the method pointer tables in address order, so the reads
+        # move forward through the image instead of hopping between modules
+        method_tables: List[Sequence[int]] = [[] for _ in modules]
+        for i in sorted(range(len(modules)), key=lambda i: modules[i][1].method_pointers):
+            module = modules[i][1]
+            method_tables[i] = self._read_ptr_table_or_zeros(module.method_pointers, module.method_pointer_count)
+
+        # Finally register everything in the original module order
+        for (module_name, module), method_ptrs in zip(modules, method_tables):
             self.code_gen_modules[module_name] = module
-
-            # Method pointers
-            try:
-                method_ptrs = self.map_vatr_array(module.method_pointers, module.method_pointer_count)
-            except:
-                method_ptrs = [0] * module.method_pointer_count
-
             self.code_gen_module_method_pointers[module_name] = method_ptrs
 
             # RGCTX data
@@ -413,35 +481,116 @@ class Il2Cpp(BinaryStream, ABC):
             self.rgctxs_dictionary[module_name] = rgctx_def_dic
 
             if module.rgctxs_count > 0:
-                self.position = self.map_vatr(module.rgctxs)
+                self.position = self._map_vatr_cached(module.rgctxs)
                 rgctxs = self.read_class_array_fast(Il2CppRGCTXDefinition, count=module.rgctxs_count)
 
-                self.position = self.map_vatr(module.rgctx_ranges)
-                rgctx_ranges = self.read_class_array_fast(Il2CppTokenRangePair, count=module.rgctx_ranges_count)
+                # The ranges are only read once here, so they are unpacked as
+                # plain (token, range_start, range_length) tuples rather than
+                # built as Il2CppTokenRangePair objects
+                rgctx_ranges = self.unpack_records(
+                    _TOKEN_RANGE_PAIR_STRUCT, self._map_vatr_cached(module.rgctx_ranges), module.rgctx_ranges_count
+                )
+
+                for token, start, length in rgctx_ranges:
+                    rgctx_def_dic[token] = rgctxs[start:start + length]
+
+    def _read_ptr_table_or_zeros(self, addr: int, count: int) -> Sequence[int]:
+        """Pointer table at a virtual address, or zeros if it doesn't fit in the image."""
+        offset = self._map_vatr_checked(addr, count * self.pointer_size)
+        if offset < 0:
+            return [0] * count
+        return self.read_ptr_table(offset, count)
+
+    def _map_vatr_checked(self, addr: int, size: int) -> int:
+        """
+        File offset of `size` bytes at a virtual address, or -1 if they
+        aren't all in the image.
 
-                for rgctx_range in rgctx_ranges:
-                    if rgctx_range.range:
-                        start = rgctx_range.range.start
-                        length = rgctx_range.range.length
-                        rgctx_def_dic[rgctx_range.token] = rgctxs[start:start + length]
+        Null pointers and empty ranges are rejected up front, so modules
+        without a table never reach the mapping's ValueError.
+        """
+        if addr == 0 or size <= 0:
+            return -1
+        try:
+            offset = self._map_vatr_cached(addr)
+        except ValueError:
+            return -1
+        if offset < 0 or offset + size > len(self._data):
+            return -1
+        return offset
 
     # ========== Helper Methods ==========
 
+    def _vatr_linear_range(self, addr: int) -> Optional[Tuple[int, int]]:
+        """
+        Bounds of the address range map_vatr() translates linearly around addr.
+
+        Returns a half-open (start, end) range in which map_vatr(x) - x is
+        the same for every x, or None when the format can't tell, in which
+        case _map_vatr_cached() never caches the page.
+        """
+        return None
+
+    def _map_vatr_cached(self, addr: int) -> int:
+        """
+        map_vatr() with a per-page translation cache.
+
+        Pointer walks during init() stay within a few pages at a time, so the
+        segment lookup is done once per page. A page is cached only when it
+        lies entirely inside the range _vatr_linear_range() reports for addr;
+        any other page keeps going through map_vatr().
+        """
+        page = addr >> _VATR_PAGE_SHIFT
+        cache = self._vatr_page_cache
+        if page in cache:
+            delta = cache[page]
+            if delta is not None:
+                return addr + delta
+            return self.map_vatr(addr)
+
+        offset = self.map_vatr(addr)
+        bounds = self._vatr_linear_range(addr)
+        lo = page << _VATR_PAGE_SHIFT
+        linear = bounds is not None and bounds[0] <= lo and lo + _VATR_PAGE_MASK < bounds[1]
+        cache[page] = offset - addr if linear else None
+        return offset
+
+    def _map_vatr_many(self, addrs: Iterable[int]) -> List[int]:
+        """_map_vatr_cached() over many addresses, with every lookup bound once."""
+        cache_get = self._vatr_page_cache.get
+        map_one = self._map_vatr_cached
+        offsets: List[int] = []
+        append = offsets.append
+        for addr in addrs:
+            delta = cache_get(addr >> _VATR_PAGE_SHIFT)
+            append(addr + delta if delta is not None else map_one(addr))
+        return offsets
+
     def map_vatr_class(self, cls: Type[T], addr: int) -> T:
         """Read a class at a virtual address."""
-        return self.read_class(cls, self.map_vatr(addr))
+        return self.read_class(cls, self._map_vatr_cached(addr))
 
     def map_vatr_array(self, addr: int, count: int) -> List[int]:
         """Read an array of pointers at a virtual address."""
-        return self.read_ptr_array(self.map_vatr(addr), count)
+        return self.read_ptr_array(self._map_vatr_cached(addr), count)
+
+    def map_vatr_ptr_table(self, addr: int, count: int) -> Sequence[int]:
+        """Read a pointer table at a virtual address into a compact array."""
+        return self.read_ptr_table(self._map_vatr_cached(addr), count)
 
     def map_vatr_uint32_array(self, addr: int, count: int) -> List[int]:
         """Read an array of uint32 at a virtual address."""
-        return self.read_uint32_array(self.map_vatr(addr), count)
+        return self.read_uint32_array(self._map_vatr_cached(addr), count)
 
     def get_il2cpp_type(self, pointer: int) -> Optional[Il2CppType]:
         """Get an IL2CPP type by its pointer."""
-        return self._type_dic.get(pointer)
+        if pointer == self._last_type_ptr:
+            return self._last_type
+        index = self._type_index_by_ptr.get(pointer)
+        il2cpp_type = self.types[index] if index is not None else None
+        self._last_type_ptr = pointer
+        self._last_type = il2cpp_type
+        return il2cpp_type
 
     def get_field_offset_from_index(
         self,
@@ -465,19 +614,19 @@ class Il2Cpp(BinaryStream, ABC):
             Field offset, or -1 if not found
         """
         try:
-            offset = -1
-
             if self._field_offsets_are_pointers:
                 ptr = self._field_offsets[type_index]
-                if ptr > 0:
-                    self.position = self.map_vatr(ptr) + 4 * field_index_in_type
-                    offset = self.read_int32()
+                if ptr <= 0:
+                    return -1
+                # Read the int32 in place; the stream position is left alone
+                offset = _INT32_STRUCT.unpack_from(
+                    self._data, self._map_vatr_cached(ptr) + 4 * field_index_in_type)[0]
             else:
                 offset = self._field_offsets[field_index]
 
             if offset > 0 and is_value_type and not is_static:
                 # Adjust for value type header
-                offset -= 8 if self.is_32bit else 16
+                offset -= self._value_type_header_size
 
             return offset
         except:
@@ -5,10 +5,13 @@ This module parses the IL2CPP metadata file which contains all .NET type informa
 including class definitions, method definitions, field definitions, string literals, etc.
 """
 
-from typing import Dict, List, Optional, Tuple, Any
+import os
+import sys
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple, Any, Union
 from dataclasses import fields
 
-from ..io.binary_stream import BinaryStream
+from ..io.binary_stream import BinaryStream, map_file
 from .structures import (
     Il2CppGlobalMetadataHeader,
     Il2CppImageDefinition,
@@ -98,29 +101,40 @@ class Metadata(BinaryStream):
         # Build lookup dictionaries
         self._build_lookups()
 
+    @classmethod
+    def from_path(cls, path: Union[str, os.PathLike]) -> 'Metadata':
+        """
+        Open a metadata file from disk without reading it into memory.
+
+        The file is memory-mapped read-only; tables and strings are sliced
+        out of the mapping as they are needed.
+        """
+        return cls(map_file(path))
+
     def _read_header(self) -> Il2CppGlobalMetadataHeader:
         """Read the metadata header with version-aware parsing."""
         return self.read_class(Il2CppGlobalMetadataHeader)
 
     def _detect_subversion(self) -> None:
         """Detect sub-versions (e.g., 24.1, 24.2) based on header values."""
-        if self.version == 24:
-            # Check for 24.2
-            if self.header.string_literal_offset == 264:
-                self.version = 24.2
-                self.position = 0
-                self.header = self._read_header()
-            else:
-                # Check for 24.1 by examining image definitions
-                self.image_defs = self._read_metadata_array(
-                    Il2CppImageDefinition,
-                    self.header.images_offset,
-                    self.header.images_size
-                )
-                if any(img.token != 1 for img in self.image_defs):
-                    self.version = 24.1
+        if self.version != 24:
+            return
+
+        # Check for 24.2
+        if self.header.string_literal_offset == 264:
+            self.version = 24.2
+        else:
+            # Check for 24.1 by examining image definition tokens; only the
+            # token column is pulled, the images are read by _load_metadata
+            images = self._read_metadata_table(
+                Il2CppImageDefinition,
+                self.header.images_offset,
+                self.header.images_size
+            )
+            if images and any(token != 1 for token in images.column('token')):
+                self.version = 24.1
 
-        # Re-read header with correct version
+        # Re-read header with the sub-version, once, if one was detected
         if self.version != 24:
             self.position = 0
             self.header = self._read_header()
@@ -129,6 +143,10 @@ class Metadata(BinaryStream):
         """Load all metadata arrays from the file."""
         h = self.header
 
+        # Filled while processing usage pairs, which only v17-26 has
+        self.metadata_usage_arrays: List[Optional[array]] = []
+        self.metadata_usages_count = 0
+
         # Image definitions
         self.image_defs = self._read_metadata_array(
             Il2CppImageDefinition, h.images_offset, h.images_size
@@ -139,11 +157,14 @@ class Metadata(BinaryStream):
             self.version = 24.4
 
         # Assembly definitions
-        self.assembly_defs = self._read_metadata_array(
+        self.assembly_defs = self._read_metadata_table(
             Il2CppAssemblyDefinition, h.assemblies_offset, h.assemblies_size
         )
 
-        # Type definitions
+        # Type definitions. Kept as whole records: the writers read a type's
+        # start/count pairs together while emitting that one type, and a
+        # count is a single slot load on the record, so a separate column
+        # store for the ushort counts would only add an index per access
         self.type_defs = self._read_metadata_array(
             Il2CppTypeDefinition, h.type_definitions_offset, h.type_definitions_size
         )
@@ -163,16 +184,16 @@ class Metadata(BinaryStream):
             Il2CppFieldDefinition, h.fields_offset, h.fields_size
         )
 
-        # Default values
-        field_default_values = self._read_metadata_array(
+        # Default values, indexed by owner; only entries that are looked up get decoded
+        self._field_default_values = self._read_metadata_table(
             Il2CppFieldDefaultValue, h.field_default_values_offset, h.field_default_values_size
         )
-        self._field_default_values_dic = {v.field_index: v for v in field_default_values}
+        self._field_default_values_dic = self._index_by_column(self._field_default_values, 'field_index')
 
-        param_default_values = self._read_metadata_array(
+        self._param_default_values = self._read_metadata_table(
             Il2CppParameterDefaultValue, h.parameter_default_values_offset, h.parameter_default_values_size
         )
-        self._param_default_values_dic = {v.parameter_index: v for v in param_default_values}
+        self._param_default_values_dic = self._index_by_column(self._param_default_values, 'parameter_index')
 
         # Property definitions
         self.property_defs = self._read_metadata_array(
@@ -190,17 +211,17 @@ class Metadata(BinaryStream):
         )
 
         # Event definitions
-        self.event_defs = self._read_metadata_array(
+        self.event_defs = self._read_metadata_table(
             Il2CppEventDefinition, h.events_offset, h.events_size
         )
 
         # Generic containers
-        self.generic_containers = self._read_metadata_array(
+        self.generic_containers = self._read_metadata_table(
             Il2CppGenericContainer, h.generic_containers_offset, h.generic_containers_size
         )
 
         # Generic parameters
-        self.generic_parameters = self._read_metadata_array(
+        self.generic_parameters = self._read_metadata_table(
             Il2CppGenericParameter, h.generic_parameters_offset, h.generic_parameters_size
         )
 
@@ -222,18 +243,18 @@ class Metadata(BinaryStream):
 
         # Field refs (v19+)
         if self.version > 16:
-            self.field_refs = self._read_metadata_array(
+            self.field_refs = self._read_metadata_table(
                 Il2CppFieldRef, h.field_refs_offset, h.field_refs_size
             )
 
             # Metadata usage (v17-26)
             if self.version < 27:
-                self._metadata_usage_lists = self._read_metadata_array(
+                self._metadata_usage_lists = self._read_metadata_table(
                     Il2CppMetadataUsageList,
                     h.metadata_usage_lists_offset,
                     h.metadata_usage_lists_count
                 )
-                self._metadata_usage_pairs = self._read_metadata_array(
+                self._metadata_usage_pairs = self._read_metadata_table(
                     Il2CppMetadataUsagePair,
                     h.metadata_usage_pairs_offset,
                     h.metadata_usage_pairs_count
@@ -242,7 +263,7 @@ class Metadata(BinaryStream):
 
         # Attribute type ranges (v21-28)
         if 20 < self.version < 29:
-            self.attribute_type_ranges = self._read_metadata_array(
+            self.attribute_type_ranges = self._read_metadata_table(
                 Il2CppCustomAttributeTypeRange,
                 h.attributes_info_offset,
                 h.attributes_info_count
@@ -253,7 +274,7 @@ class Metadata(BinaryStream):
 
         # Attribute data ranges (v29+)
         if self.version >= 29:
-            self.attribute_data_ranges = self._read_metadata_array(
+            self.attribute_data_ranges = self._read_metadata_table(
                 Il2CppCustomAttributeDataRange,
                 h.attribute_data_range_offset,
                 h.attribute_data_range_size
@@ -265,15 +286,12 @@ class Metadata(BinaryStream):
 
         # RGCTX entries (v16-24.1)
         if self.version <= 24.1:
-            self.rgctx_entries = self._read_metadata_array(
+            self.rgctx_entries = self._read_metadata_table(
                 Il2CppRGCTXDefinition,
                 h.rgctx_entries_offset,
                 h.rgctx_entries_count
             )
 
-        # Calculate metadata usages count
-        self.metadata_usages_count = self._calculate_metadata_usages_count()
-
     def _read_metadata_array(self, cls, offset: int, size: int) -> List:
         """Read an array of metadata structures using optimized batch reading."""
         if offset == 0 or size == 0:
@@ -287,55 +305,114 @@ class Metadata(BinaryStream):
         self.position = offset
         return self.read_class_array_fast(cls, count=count)
 
-    def _build_lookups(self) -> None:
-        """Build lookup dictionaries for fast access."""
-        self._string_cache: Dict[int, str] = {}
+    def _read_metadata_table(self, cls, offset: int, size: int) -> Sequence:
+        """Like _read_metadata_array, but entries are decoded on first access."""
+        if offset == 0 or size == 0:
+            return []
 
-    def _build_attribute_lookup(self) -> None:
-        """Build attribute type range lookup by token."""
-        self._attribute_type_ranges_dic: Dict[int, Dict[int, int]] = {}
+        element_size = self.size_of(cls)
+        if element_size == 0:
+            return []
 
-        for image_def in self.image_defs:
-            dic: Dict[int, int] = {}
-            self._attribute_type_ranges_dic[id(image_def)] = dic
+        return self.read_record_table(cls, offset, size // element_size)
 
-            end = image_def.custom_attribute_start + image_def.custom_attribute_count
-            for i in range(image_def.custom_attribute_start, end):
-                if self.version >= 29:
-                    dic[self.attribute_data_ranges[i].token] = i
-                else:
-                    dic[self.attribute_type_ranges[i].token] = i
+    @staticmethod
+    def _index_by_column(table: Sequence, name: str) -> Dict[int, int]:
+        """Map each value of a table column to the last row holding it."""
+        if not table:
+            return {}
+        keys = table.column(name)
+        return dict(zip(keys, range(len(keys))))
 
-    def _process_metadata_usage(self) -> None:
-        """Process metadata usage lists and pairs."""
-        self.metadata_usage_dic: Dict[int, Dict[int, int]] = {
-            i: {} for i in range(1, 7)
-        }
+    def _build_lookups(self) -> None:
+        """Build lookup dictionaries for fast access."""
+        self._string_cache: Dict[int, str] = self._scan_strings()
 
-        for usage_list in self._metadata_usage_lists:
-            for i in range(usage_list.count):
-                offset = usage_list.start + i
-                if offset >= len(self._metadata_usage_pairs):
-                    continue
+    def _scan_strings(self) -> Dict[int, str]:
+        """
+        Decode the string table once, keyed by each string's start index.
 
-                pair = self._metadata_usage_pairs[offset]
-                usage = self._get_encoded_index_type(pair.encoded_source_index)
-                decoded = self._get_decoded_method_index(pair.encoded_source_index)
+        Only NUL-terminated strings are taken; anything after the last NUL,
+        and any index that doesn't start a string, is read on demand.
+        Identifiers and dotted names (namespaces, ".ctor") are interned, as
+        the dump keys caches on them and joins them over and over.
+        """
+        h = self.header
+        if h.string_offset <= 0 or h.string_size <= 0:
+            return {}
+
+        intern = sys.intern
+        strings: Dict[int, str] = {}
+        index = 0
+        pieces = self._data[h.string_offset:h.string_offset + h.string_size].split(b'\x00')
+        for raw in pieces[:-1]:
+            text = raw.decode('utf-8', errors='replace')
+            if text.replace('.', '_').isidentifier():
+                text = intern(text)
+            strings[index] = text
+            index += len(raw) + 1
+        return strings
 
-                if 1 <= usage <= 6:
-                    self.metadata_usage_dic[usage][pair.destination_index] = decoded
+    def _build_attribute_lookup(self) -> None:
+        """Build attribute type range lookup by token."""
+        # Pull the token column once; no range entry is decoded
+        ranges = self.attribute_data_ranges if self.version >= 29 else self.attribute_type_ranges
+        tokens = ranges.column('token') if ranges else []
 
-    def _calculate_metadata_usages_count(self) -> int:
-        """Calculate total metadata usages count."""
-        if not hasattr(self, 'metadata_usage_dic'):
-            return 0
+        # One token -> range index dict per image, in image_defs order
+        self._attribute_type_ranges_dic: List[Dict[int, int]] = []
+        for image_def in self.image_defs:
+            start = image_def.custom_attribute_start
+            end = start + image_def.custom_attribute_count
+            self._attribute_type_ranges_dic.append(dict(zip(tokens[start:end], range(start, end))))
 
-        max_index = 0
-        for dic in self.metadata_usage_dic.values():
-            if dic:
-                max_index = max(max_index, max(dic.keys()))
+    def _process_metadata_usage(self) -> None:
+        """
+        Process metadata usage lists and pairs.
 
-        return max_index + 1
+        metadata_usage_arrays holds one array per usage type (None for 0),
+        indexed by destination index, with -1 where no pair lands.
+        metadata_usages_count is one past the highest destination filled.
+        """
+        self.metadata_usage_arrays = [None] + [array('i') for _ in range(6)]
+        self.metadata_usages_count = 1
+
+        lists = self._metadata_usage_lists
+        pairs = self._metadata_usage_pairs
+        if not lists or not pairs:
+            return
+
+        # Work on plain columns; no list or pair entry is decoded
+        destinations = pairs.column('destination_index')
+        sources = pairs.column('encoded_source_index')
+
+        # Destinations are small dense ints, so every usage type gets a flat
+        # array covering all of them instead of a dict
+        size = max(max(destinations) + 1, 0)
+        for usage in range(1, 7):
+            self.metadata_usage_arrays[usage] = array('i', [-1]) * size
+
+        # Target array per encoded usage type (0 and 7 are not usages), and
+        # the index decode from _get_decoded_method_index as a mask and shift
+        usage_arrays = [*self.metadata_usage_arrays, None]
+        index_mask = 0x1FFFFFFE if self.version >= 27 else 0x1FFFFFFF
+        index_shift = 1 if self.version >= 27 else 0
+
+        max_destination = 0
+        for start, count in zip(lists.column('start'), lists.column('count')):
+            # Pairs outside the table, and negative destinations, are skipped
+            end = start + count
+            if count <= 0 or end <= 0:
+                continue
+            start = max(start, 0)
+            for destination, source in zip(destinations[start:end], sources[start:end]):
+                usages = usage_arrays[(source & 0xE0000000) >> 29]
+                if usages is not None and destination >= 0:
+                    usages[destination] = (source & index_mask) >> index_shift
+                    if destination > max_destination:
+                        max_destination = destination
+
+        self.metadata_usages_count = max_destination + 1
 
     def _get_encoded_index_type(self, index: int) -> int:
         """Get the type from an encoded index."""
@@ -359,11 +436,14 @@ class Metadata(BinaryStream):
         Returns:
             The decoded string
         """
-        if index in self._string_cache:
-            return self._string_cache[index]
-
-        result = self.read_string_to_null(self.header.string_offset + index)
-        self._string_cache[index] = result
+        result = self._string_cache.get(index)
+        if result is None:
+            # Slice straight out of the buffer; the stream position is untouched
+            data = self._data
+            start = self.header.string_offset + index
+            end = data.find(b'\x00', start)
+            result = (data[start:end] if end >= 0 else data[start:]).decode('utf-8', errors='replace')
+            self._string_cache[index] = result
         return result
 
     def get_string_literal_from_index(self, index: int) -> str:
@@ -377,16 +457,18 @@ class Metadata(BinaryStream):
             The decoded string literal
         """
         string_literal = self.string_literals[index]
-        self.position = self.header.string_literal_data_offset + string_literal.data_index
-        return self.read_bytes(string_literal.length).decode('utf-8', errors='replace')
+        start = self.header.string_literal_data_offset + string_literal.data_index
+        return self._data[start:start + string_literal.length].decode('utf-8', errors='replace')
 
     def get_field_default_value_from_index(self, index: int) -> Optional[Il2CppFieldDefaultValue]:
         """Get field default value by field index."""
-        return self._field_default_values_dic.get(index)
+        row = self._field_default_values_dic.get(index)
+        return self._field_default_values[row] if row is not None else None
 
     def get_parameter_default_value_from_index(self, index: int) -> Optional[Il2CppParameterDefaultValue]:
         """Get parameter default value by parameter index."""
-        return self._param_default_values_dic.get(index)
+        row = self._param_default_values_dic.get(index)
+        return self._param_default_values[row] if row is not None else None
 
     def get_default_value_from_index(self, index: int) -> int:
         """Get default value data offset."""
@@ -394,7 +476,7 @@ class Metadata(BinaryStream):
 
     def get_custom_attribute_index(
         self,
-        image_def: Il2CppImageDefinition,
+        image_index: int,
         custom_attribute_index: int,
         token: int
     ) -> int:
@@ -402,7 +484,7 @@ class Metadata(BinaryStream):
         Get custom attribute index for a token.
 
         Args:
-            image_def: The image definition
+            image_index: Index of the image in image_defs
             custom_attribute_index: Legacy custom attribute index (for v24 and below)
             token: The metadata token
 
@@ -410,8 +492,7 @@ class Metadata(BinaryStream):
             The custom attribute index, or -1 if not found
         """
         if self.version > 24:
-            dic = self._attribute_type_ranges_dic.get(id(image_def), {})
-            return dic.get(token, -1)
+            return self._attribute_type_ranges_dic[image_index].get(token, -1)
         else:
             return custom_attribute_index
 
@@ -6,19 +6,23 @@ and metadata files. Fields marked with version_field() are only present in certa
 IL2CPP versions.
 """
 
+import itertools
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple, Type
 from ..io.version_aware import version_field
 
 
 def array_field(length: int, default_factory=None):
-    """Create a field for fixed-size arrays."""
-    if default_factory is None:
-        default_factory = lambda: b'\x00' * length
-    return field(
-        default_factory=default_factory,
-        metadata={'array_length': length}
-    )
+    """
+    Create a field for fixed-size arrays.
+
+    Without a factory the default is one shared zeroed bytes object, which
+    is safe since bytes are immutable and costs nothing per instance.
+    """
+    metadata = {'array_length': length}
+    if default_factory is not None:
+        return field(default_factory=default_factory, metadata=metadata)
+    return field(default=b'\x00' * length, metadata=metadata)
 
 
 def ushort_field(default: int = 0):
@@ -177,7 +181,7 @@ class Il2CppAssemblyNameDefinition:
     minor: int = 0
     build: int = 0
     revision: int = 0
-    public_key_token: bytes = array_field(8, lambda: b'\x00' * 8)
+    public_key_token: bytes = array_field(8)
 
 
 @dataclass
@@ -194,7 +198,7 @@ class Il2CppAssemblyDefinition:
     aname: Optional['Il2CppAssemblyNameDefinition'] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppTypeDefinition:
     """Type (class/struct/enum/interface) definition."""
     name_index: int = 0
@@ -249,7 +253,7 @@ class Il2CppTypeDefinition:
         return ((self.bitfield >> 1) & 0x1) == 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppMethodDefinition:
     """Method definition."""
     name_index: int = 0  # uint
@@ -274,7 +278,7 @@ class Il2CppMethodDefinition:
     parameter_count: int = ushort_field(0)
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppParameterDefinition:
     """Parameter definition."""
     name_index: int = 0
@@ -284,7 +288,7 @@ class Il2CppParameterDefinition:
     type_index: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppFieldDefinition:
     """Field definition."""
     name_index: int = 0
@@ -381,21 +385,21 @@ class Il2CppMetadataUsageList:
     count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppMetadataUsagePair:
     """Metadata usage pair."""
     destination_index: int = 0
     encoded_source_index: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppStringLiteral:
     """String literal."""
     length: int = 0
     data_index: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppFieldRef:
     """Field reference."""
     type_index: int = 0
@@ -439,7 +443,7 @@ class Il2CppRGCTXDefinition:
 # Runtime Structures (from IL2CPP binary)
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppCodeRegistration:
     """Code registration structure. All fields are pointer-sized (8 bytes on 64-bit)."""
     # Version <= 24.1
@@ -489,7 +493,7 @@ class Il2CppCodeRegistration:
     code_gen_modules: int = ptr_version_field(min_ver=24.2, default=0)
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppMetadataRegistration:
     """Metadata registration structure. All fields are pointer-sized (8 bytes on 64-bit)."""
     generic_classes_count: int = ptr_field(0)
@@ -514,132 +518,168 @@ class Il2CppMetadataRegistration:
     metadata_usages: int = ptr_version_field(min_ver=19, default=0)
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppType:
-    """IL2CPP type representation."""
+    """
+    IL2CPP type representation.
+
+    Only the raw record is stored; attrs, type and the flags in the top byte
+    of bits are decoded when read. This class has the pre-27.2 bit layout,
+    Il2CppTypeV27_2 the later one, and from_raw picks between them once so
+    no getter branches on the version.
+    """
     datapoint: int = ulong_field(0)  # ulong (8 bytes)
     bits: int = 0  # uint (4 bytes)
 
-    # Parsed values (set after reading)
-    _attrs: int = 0
-    _type: int = 0
-    _num_mods: int = 0
-    _byref: int = 0
-    _pinned: int = 0
-    _valuetype: int = 0
-
-    def init(self, version: float) -> None:
-        """Initialize parsed values from bits."""
-        self._attrs = self.bits & 0xFFFF
-        self._type = (self.bits >> 16) & 0xFF
-
-        if version >= 27.2:
-            self._num_mods = (self.bits >> 24) & 0x1F
-            self._byref = (self.bits >> 29) & 1
-            self._pinned = (self.bits >> 30) & 1
-            self._valuetype = self.bits >> 31
-        else:
-            self._num_mods = (self.bits >> 24) & 0x3F
-            self._byref = (self.bits >> 30) & 1
-            self._pinned = self.bits >> 31
+    @classmethod
+    def for_version(cls, version: float) -> Type['Il2CppType']:
+        """Return the class whose getters match the bit layout of a version."""
+        return Il2CppTypeV27_2 if version >= 27.2 else Il2CppType
+
+    @classmethod
+    def from_raw(cls, datapoint: int, bits: int, version: float) -> 'Il2CppType':
+        """Build a type from its raw record."""
+        return cls.for_version(version)(datapoint, bits)
+
+    @classmethod
+    def from_raw_table(cls, records: Iterable[Tuple[int, int]], version: float) -> List['Il2CppType']:
+        """Build a type per (datapoint, bits) record, as from_raw does, in one pass."""
+        return list(itertools.starmap(cls.for_version(version), records))
 
     @property
     def attrs(self) -> int:
-        return self._attrs
+        return self.bits & 0xFFFF
 
     @property
     def type(self) -> int:
-        return self._type
+        return (self.bits >> 16) & 0xFF
+
+    @property
+    def num_mods(self) -> int:
+        return (self.bits >> 24) & 0x3F
 
     @property
     def byref(self) -> int:
-        return self._byref
+        return (self.bits >> 30) & 1
 
     @property
     def pinned(self) -> int:
-        return self._pinned
+        return self.bits >> 31
 
-    # Data union accessors
     @property
-    def klass_index(self) -> int:
-        """For VALUETYPE and CLASS."""
-        return self.datapoint
+    def valuetype(self) -> int:
+        return 0
 
-    @property
-    def type_handle(self) -> int:
-        """For VALUETYPE and CLASS at runtime."""
-        return self.datapoint
 
-    @property
-    def type_ptr(self) -> int:
-        """For PTR and SZARRAY."""
-        return self.datapoint
+class Il2CppTypeV27_2(Il2CppType):
+    """Il2CppType for 27.2+, where num_mods is 5 bits and valuetype was added."""
+    __slots__ = ()
 
     @property
-    def array(self) -> int:
-        """For ARRAY."""
-        return self.datapoint
+    def num_mods(self) -> int:
+        return (self.bits >> 24) & 0x1F
 
     @property
-    def generic_parameter_index(self) -> int:
-        """For VAR and MVAR."""
-        return self.datapoint
+    def byref(self) -> int:
+        return (self.bits >> 29) & 1
 
     @property
-    def generic_parameter_handle(self) -> int:
-        """For VAR and MVAR at runtime."""
-        return self.datapoint
+    def pinned(self) -> int:
+        return (self.bits >> 30) & 1
 
     @property
-    def generic_class(self) -> int:
-        """For GENERICINST."""
-        return self.datapoint
+    def valuetype(self) -> int:
+        return self.bits >> 31
 
 
-@dataclass
+# Data union accessors. Each name reads the datapoint slot through the same
+# member descriptor, so they cost no more than .datapoint itself:
+#   klass_index, type_handle          VALUETYPE and CLASS (handle at runtime)
+#   type_ptr                          PTR and SZARRAY
+#   array                             ARRAY
+#   generic_parameter_index/_handle   VAR and MVAR (handle at runtime)
+#   generic_class                     GENERICINST
+Il2CppType.klass_index = Il2CppType.type_handle = Il2CppType.datapoint
+Il2CppType.type_ptr = Il2CppType.array = Il2CppType.datapoint
+Il2CppType.generic_parameter_index = Il2CppType.generic_parameter_handle = Il2CppType.datapoint
+Il2CppType.generic_class = Il2CppType.datapoint
+
+
+@dataclass(slots=True)
 class Il2CppGenericClass:
     """Generic class instance. All fields are pointer-sized (8 bytes on 64-bit)."""
     # Version <= 24.5
     type_definition_index: int = ptr_version_field(max_ver=24.5, default=0)
     # Version 27+
     type: int = ptr_version_field(min_ver=27, default=0)
-    context: Optional['Il2CppGenericContext'] = None
+    # Il2CppGenericContext, stored inline so the record is one flat read
+    class_inst: int = ptr_field(0)
+    method_inst: int = ptr_field(0)
     cached_class: int = ptr_field(0)
 
+    @property
+    def context(self) -> 'Il2CppGenericContext':
+        """The embedded generic context as its own structure."""
+        return Il2CppGenericContext(self.class_inst, self.method_inst)
 
-@dataclass
+
+@dataclass(slots=True)
 class Il2CppGenericContext:
     """Generic context. All fields are pointer-sized (8 bytes on 64-bit)."""
     class_inst: int = ptr_field(0)
     method_inst: int = ptr_field(0)
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppGenericInst:
     """Generic instantiation. All fields are pointer-sized (8 bytes on 64-bit)."""
     type_argc: int = ptr_field(0)
     type_argv: int = ptr_field(0)
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppArrayType:
-    """Array type."""
-    etype: int = 0
-    rank: int = 0  # byte
-    numsizes: int = 0  # byte
-    numlobounds: int = 0  # byte
-    sizes: int = 0
-    lobounds: int = 0
+    """
+    Array type. All fields are pointer-sized (8 bytes on 64-bit).
 
+    rank, numsizes and numlobounds are one byte each; they are read with
+    the padding after them as a single word and split on access.
+    """
+    etype: int = ptr_field(0)
+    bounds: int = ptr_field(0)  # rank, numsizes, numlobounds, padding
+    sizes: int = ptr_field(0)
+    lobounds: int = ptr_field(0)
 
-@dataclass
+    @property
+    def rank(self) -> int:
+        return self.bounds & 0xFF
+
+    @property
+    def numsizes(self) -> int:
+        return (self.bounds >> 8) & 0xFF
+
+    @property
+    def numlobounds(self) -> int:
+        return (self.bounds >> 16) & 0xFF
+
+
+@dataclass(slots=True)
 class Il2CppGenericMethodFunctionsDefinitions:
-    """Generic method function definitions."""
+    """
+    Generic method function definitions.
+
+    The Il2CppGenericMethodIndices this embeds are stored inline, so a table
+    entry is one flat record and one object.
+    """
     generic_method_index: int = 0
-    indices: Optional['Il2CppGenericMethodIndices'] = None
+    # Il2CppGenericMethodIndices
+    method_index: int = 0
+    invoker_index: int = 0
+    # Version 24.5 and 27.1+
+    adjustor_thunk: int = version_field(min_ver=24.5, default=0)
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppGenericMethodIndices:
     """Generic method indices."""
     method_index: int = 0
@@ -648,7 +688,7 @@ class Il2CppGenericMethodIndices:
     adjustor_thunk: int = version_field(min_ver=24.5, default=0)
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppMethodSpec:
     """Method specification."""
     method_definition_index: int = 0
@@ -656,7 +696,7 @@ class Il2CppMethodSpec:
     method_index_index: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppCodeGenModule:
     """Code generation module. All fields are pointer-sized (8 bytes on 64-bit)."""
     module_name: int = ptr_field(0)
@@ -682,15 +722,16 @@ class Il2CppCodeGenModule:
     code_registration: int = ptr_version_field(min_ver=27, default=0)
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppRange:
     """Range structure."""
     start: int = 0
     length: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Il2CppTokenRangePair:
-    """Token range pair."""
+    """Token range pair, with its Il2CppRange stored inline."""
     token: int = 0
-    range: Optional['Il2CppRange'] = None
+    range_start: int = 0
+    range_length: int = 0
@@ -2,7 +2,7 @@
 IO module for binary stream handling.
 """
 
-from .binary_stream import BinaryStream
+from .binary_stream import BinaryStream, map_file
 from .version_aware import version_field, VersionRange
 
-__all__ = ['BinaryStream', 'version_field', 'VersionRange']
+__all__ = ['BinaryStream', 'map_file', 'version_field', 'VersionRange']
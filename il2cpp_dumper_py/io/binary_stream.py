@@ -5,13 +5,17 @@ This module provides a BinaryStream class that can read binary data
 with support for version-conditional fields, similar to the C# implementation.
 """
 
+import array
+import mmap
+import os
 import struct
+from collections.abc import Sequence
 from io import BytesIO
 from typing import (
     TypeVar, Type, List, Optional, Any, Dict, Union, Tuple,
     get_type_hints, get_origin, get_args, Callable
 )
-from dataclasses import fields, is_dataclass, MISSING
+from dataclasses import Field, fields, is_dataclass, MISSING
 import sys
 
 from .version_aware import (
@@ -25,17 +29,126 @@ T = TypeVar('T')
 # Key: (dataclass_type, version) -> (struct_format, field_names, struct_size, nested_fields)
 _STRUCT_CACHE: Dict[Tuple[type, float], Tuple[str, List[str], int, Dict[str, type]]] = {}
 
+# Cache for compiled flat-record readers
+# Key: (dataclass_type, version) -> (compiled_struct, positional, build)
+# positional is True when the unpacked values line up with the constructor's
+# leading parameters, so cls(*values) builds the instance directly. build
+# turns one unpacked record into an instance; it is None unless every field
+# present at the version is in compiled_struct.
+_LAYOUT_CACHE: Dict[Tuple[type, float], Tuple[struct.Struct, bool, Optional[Callable[[tuple], Any]]]] = {}
+
+# Cache for version-specialized single-record readers
+# Key: (dataclass_type, version) -> read(buffer, offset) returning
+# (instance, end_offset), or False when the record isn't one flat unpack
+_READER_CACHE: Dict[Tuple[type, float], Any] = {}
+
+# Cache for dataclass reflection
+# Key: (dataclass_type, version) -> ((field, resolved_type), ...) for the
+# fields present at that version, in declaration order
+_FIELD_CACHE: Dict[Tuple[type, float], Tuple[Tuple[Field, Any], ...]] = {}
+
 # Cache for struct sizes
 # Key: (dataclass_type, version) -> size
 _SIZE_CACHE: Dict[Tuple[type, float], int] = {}
 
+# Precompiled primitive layouts shared by the scalar readers and writers
+_BOOL = struct.Struct('<?')
+_INT8 = struct.Struct('<b')
+_INT16 = struct.Struct('<h')
+_UINT16 = struct.Struct('<H')
+_INT32 = struct.Struct('<i')
+_UINT32 = struct.Struct('<I')
+_INT64 = struct.Struct('<q')
+_UINT64 = struct.Struct('<Q')
+_FLOAT = struct.Struct('<f')
+_DOUBLE = struct.Struct('<d')
+
+
+def _active_fields(cls: type, version: float) -> Tuple[Tuple[Field, Any], ...]:
+    """
+    The dataclass fields present at a version, paired with their resolved
+    annotations. Computed once per (class, version), so readers never
+    re-check version ranges or re-resolve type hints per record.
+    """
+    cache_key = (cls, version)
+    result = _FIELD_CACHE.get(cache_key)
+    if result is None:
+        try:
+            hints = get_type_hints(cls)
+        except Exception:
+            hints = {}
+        result = _FIELD_CACHE[cache_key] = tuple(
+            (field_info, hints.get(field_info.name, field_info.type))
+            for field_info in fields(cls) if should_read_field(field_info, version)
+        )
+    return result
+
+
+class RecordTable(Sequence):
+    """
+    Read-only list of fixed-layout records that decodes entries on access.
+
+    An entry is built the first time it is indexed and kept from then on,
+    so a table that is only probed at a few indices never pays for the
+    rest. column() reads a single field across every record without
+    building any entries.
+    """
+
+    __slots__ = ('_stream', '_offset', '_layout', '_field_names', '_build', '_items')
+
+    def __init__(self, stream: 'BinaryStream', offset: int, count: int,
+                 layout: struct.Struct, field_names: List[str],
+                 build: Callable[[tuple], Any]):
+        self._stream = stream
+        self._offset = offset
+        self._layout = layout
+        self._field_names = field_names
+        self._build = build
+        self._items: List[Any] = [None] * count
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        items = self._items
+        item = items[index]
+        if item is None:
+            if index < 0:
+                index += len(items)
+            item = items[index] = self._build(self._layout.unpack_from(
+                self._stream._data, self._offset + index * self._layout.size))
+        return item
+
+    def column(self, name: str) -> List[Any]:
+        """Every record's value for one field, in table order."""
+        i = self._field_names.index(name)
+        records = self._stream.unpack_records(self._layout, self._offset, len(self._items))
+        return [values[i] for values in records]
+
+
+def map_file(path: Union[str, os.PathLike]) -> Union[mmap.mmap, bytes]:
+    """
+    Map a file read-only so its pages are loaded on demand.
+
+    Empty files cannot be mapped and are returned as empty bytes.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
 
 class BinaryStream:
     """
     Binary stream reader with version-aware deserialization.
 
-    This class provides methods to read binary data from a stream,
+    This class provides methods to read binary data from an in-memory buffer,
     supporting version-conditional field parsing similar to the C# implementation.
+    Any buffer-protocol object with slicing and find() works as the backing
+    store, so a read-only mmap of a large binary is paged in on demand
+    instead of being copied onto the heap.
 
     Attributes:
         version: The IL2CPP version being parsed
@@ -43,17 +156,22 @@ class BinaryStream:
         image_base: Base address for memory-mapped files
     """
 
-    def __init__(self, data: Union[bytes, BytesIO]):
+    def __init__(self, data: Union[bytes, bytearray, mmap.mmap, BytesIO]):
         """
         Initialize a BinaryStream.
 
         Args:
-            data: Either raw bytes or a BytesIO stream
+            data: Raw bytes, a bytearray, an mmap, or a readable stream
         """
-        if isinstance(data, bytes):
-            self._stream = BytesIO(data)
+        if isinstance(data, (bytes, bytearray, mmap.mmap)):
+            self._data = data
+        elif isinstance(data, memoryview):
+            self._data = data.tobytes()
+        elif isinstance(data, BytesIO):
+            self._data = data.getvalue()
         else:
-            self._stream = data
+            self._data = data.read()
+        self._pos = 0
 
         self.version: float = 24.0
         self.is_32bit: bool = True
@@ -77,17 +195,7 @@ class BinaryStream:
         field_names = []
         nested_fields: Dict[str, type] = {}
 
-        try:
-            hints = get_type_hints(cls)
-        except Exception:
-            hints = {}
-
-        for field_info in fields(cls):
-            if not should_read_field(field_info, self.version):
-                continue
-
-            field_type = hints.get(field_info.name, field_info.type)
-
+        for field_info, field_type in _active_fields(cls, self.version):
             # Check for explicit binary_size first
             binary_size = None
             unsigned = True
@@ -148,7 +256,12 @@ class BinaryStream:
         by caching the struct format and avoiding reflection per-read.
         """
         if addr is not None:
-            self.position = addr
+            self._pos = addr
+
+        read = _READER_CACHE.get((cls, self.version)) or self._get_record_reader(cls)
+        if read:
+            instance, self._pos = read(self._data, self._pos)
+            return instance
 
         if not is_dataclass(cls):
             return self._read_primitive(cls)
@@ -159,8 +272,8 @@ class BinaryStream:
         instance = cls()
 
         if struct_size > 0:
-            data = self.read_bytes(struct_size)
-            values = struct.unpack(format_str, data)
+            values = struct.unpack_from(format_str, self._data, self._pos)
+            self._pos += struct_size
             for name, value in zip(field_names, values):
                 setattr(instance, name, value)
 
@@ -170,6 +283,179 @@ class BinaryStream:
 
         return instance
 
+    def _get_record_layout(
+        self, cls: Type[T]
+    ) -> Tuple[struct.Struct, bool, Optional[Callable[[tuple], T]]]:
+        """Compiled struct for a dataclass's primitive fields, plus how to build instances from it."""
+        cache_key = (cls, self.version)
+        layout = _LAYOUT_CACHE.get(cache_key)
+        if layout is None:
+            format_str, field_names, _, nested_fields = self._get_struct_format(cls)
+            cls_fields = fields(cls)
+            init_names = [f.name for f in cls_fields if f.init]
+            positional = not nested_fields and init_names[:len(field_names)] == field_names
+
+            # A single unpack covers the whole record only if nothing is
+            # nested and no present field was left out of the format
+            present = len(_active_fields(cls, self.version))
+            build = None
+            if not nested_fields and present == len(field_names):
+                build = self._compile_record_builder(cls, field_names, positional)
+
+            layout = _LAYOUT_CACHE[cache_key] = (struct.Struct(format_str), positional, build)
+        return layout
+
+    def _get_record_reader(self, cls: Type[T]) -> Any:
+        """
+        Reader for one cls record at the current version, generated once.
+
+        The reader is a plain function with the compiled struct bound in,
+        read(buffer, offset) -> (instance, end_offset), so reading a record
+        takes no version checks or layout lookups. Returns False for
+        classes that aren't flat records.
+        """
+        cache_key = (cls, self.version)
+        read = _READER_CACHE.get(cache_key)
+        if read is None:
+            read = False
+            if is_dataclass(cls):
+                layout, positional, build = self._get_record_layout(cls)
+                if build is not None:
+                    field_names = self._get_struct_format(cls)[1]
+                    read = self._compile_record_reader(
+                        cls, layout, field_names, positional, build)
+            _READER_CACHE[cache_key] = read
+        return read
+
+    @staticmethod
+    def _record_builder_lines(
+        cls: type,
+        field_names: List[str],
+        namespace: Dict[str, Any]
+    ) -> Optional[List[str]]:
+        """
+        Statements creating `instance` from locals v0, v1, ... holding the
+        unpacked values, skipping __init__, or None when that isn't safe.
+        Defaults the statements need are added to namespace.
+        """
+        # __init__ is only safe to skip if it does nothing but assign
+        # fields, and every field left out of the record has a default
+        if hasattr(cls, '__post_init__'):
+            return None
+        namespace.update(cls=cls, _new=object.__new__)
+        value_names = {name: f"v{i}" for i, name in enumerate(field_names)}
+        lines = ["    instance = _new(cls)"]
+        for i, f in enumerate(fields(cls)):
+            if f.name in value_names:
+                lines.append(f"    instance.{f.name} = {value_names[f.name]}")
+            elif f.default is not MISSING:
+                namespace[f"_d{i}"] = f.default
+                lines.append(f"    instance.{f.name} = _d{i}")
+            elif f.default_factory is not MISSING:
+                namespace[f"_f{i}"] = f.default_factory
+                lines.append(f"    instance.{f.name} = _f{i}()")
+            else:
+                return None
+        return lines
+
+    @staticmethod
+    def _compile_record_builder(
+        cls: Type[T],
+        field_names: List[str],
+        positional: bool
+    ) -> Callable[[tuple], T]:
+        """
+        Function building one instance of a flat dataclass from its unpacked values.
+
+        When version-gated fields leave gaps in the constructor order, a
+        builder is generated that skips __init__ and stores the unpacked
+        values and the gap defaults directly, e.g. for fields a, (b), c:
+
+            def build(values):
+                v0, v1 = values
+                instance = _new(cls)
+                instance.a = v0
+                instance.b = _d1
+                instance.c = v1
+                return instance
+        """
+        if positional:
+            return lambda values: cls(*values)
+
+        namespace: Dict[str, Any] = {}
+        body = BinaryStream._record_builder_lines(cls, field_names, namespace)
+        if body is not None:
+            values = ''.join(f"v{i}, " for i in range(len(field_names)))
+            source = "\n".join([
+                "def build(values):",
+                f"    {values}= values",
+                *body,
+                "    return instance\n",
+            ])
+            exec(source, namespace)
+            return namespace['build']
+
+        def build(values: tuple) -> T:
+            instance = cls()
+            for name, value in zip(field_names, values):
+                setattr(instance, name, value)
+            return instance
+        return build
+
+    @staticmethod
+    def _compile_record_reader(
+        cls: Type[T],
+        layout: struct.Struct,
+        field_names: List[str],
+        positional: bool,
+        build: Callable[[tuple], T]
+    ) -> Callable[[Any, int], Tuple[T, int]]:
+        """
+        Function reading one instance of a flat dataclass at an offset,
+        with the unpack and the record size inlined, e.g. for fields a, (b), c:
+
+            def read(buffer, offset):
+                v0, v1 = _unpack_from(buffer, offset)
+                instance = _new(cls)
+                instance.a = v0
+                instance.b = _d1
+                instance.c = v1
+                return instance, offset + 8
+        """
+        namespace: Dict[str, Any] = {'_unpack_from': layout.unpack_from, 'cls': cls, '_build': build}
+        size = layout.size
+        body = None if positional else BinaryStream._record_builder_lines(cls, field_names, namespace)
+        if positional:
+            lines = [f"    return cls(*_unpack_from(buffer, offset)), offset + {size}"]
+        elif body is not None:
+            values = ''.join(f"v{i}, " for i in range(len(field_names)))
+            lines = [f"    {values}= _unpack_from(buffer, offset)", *body,
+                     f"    return instance, offset + {size}"]
+        else:
+            lines = [f"    return _build(_unpack_from(buffer, offset)), offset + {size}"]
+        exec("\n".join(["def read(buffer, offset):", *lines, ""]), namespace)
+        return namespace['read']
+
+    def read_record_table(self, cls: Type[T], addr: int, count: int) -> Sequence[T]:
+        """
+        Lazily decoded array of count instances of cls at addr.
+
+        Records are only unpacked when indexed, see RecordTable, and
+        dataclasses with nested structures are read eagerly. Raises
+        struct.error if the table runs past the end of the buffer, as an
+        eager read would. The stream position is not moved.
+        """
+        format_str, field_names, struct_size, nested_fields = self._get_struct_format(cls)
+        layout, _, build = self._get_record_layout(cls)
+        if build is None or struct_size == 0:
+            return self.read_class_array_fast(cls, addr=addr, count=count)
+
+        count = max(0, count)
+        end = addr + count * struct_size
+        if end > len(self._data):
+            raise struct.error(f"unpack requires a buffer of {end} bytes")
+        return RecordTable(self, addr, count, layout, field_names, build)
+
     def read_class_array_fast(
         self,
         cls: Type[T],
@@ -192,12 +478,17 @@ class BinaryStream:
 
         # If no nested fields, we can read all at once
         if not nested_fields and struct_size > 0:
-            total_data = self.read_bytes(struct_size * count)
-            results = []
+            layout, positional, build = self._get_record_layout(cls)
+            records = self.unpack_records(layout, self._pos, count)
+            self._pos += struct_size * len(records)
+
+            if positional:
+                return [cls(*values) for values in records]
+            if build is not None:
+                return [build(values) for values in records]
 
-            for i in range(count):
-                offset = i * struct_size
-                values = struct.unpack(format_str, total_data[offset:offset + struct_size])
+            results = []
+            for values in records:
                 instance = cls()
                 for name, value in zip(field_names, values):
                     setattr(instance, name, value)
@@ -213,21 +504,17 @@ class BinaryStream:
     @property
     def position(self) -> int:
         """Get current stream position."""
-        return self._stream.tell()
+        return self._pos
 
     @position.setter
     def position(self, value: int) -> None:
         """Set stream position."""
-        self._stream.seek(value)
+        self._pos = value
 
     @property
     def length(self) -> int:
         """Get stream length."""
-        current = self._stream.tell()
-        self._stream.seek(0, 2)  # Seek to end
-        length = self._stream.tell()
-        self._stream.seek(current)  # Restore position
-        return length
+        return len(self._data)
 
     @property
     def pointer_size(self) -> int:
@@ -238,51 +525,84 @@ class BinaryStream:
 
     def read_bytes(self, count: int) -> bytes:
         """Read raw bytes."""
-        return self._stream.read(count)
+        pos = self._pos
+        store = self._data
+        if type(store) is bytearray:
+            # Slicing a bytearray gives a bytearray; copy through a view
+            # instead so the result is immutable bytes in a single copy
+            with memoryview(store) as view:
+                data = bytes(view[pos:pos + count])
+        else:
+            data = store[pos:pos + count]
+        self._pos = pos + len(data)
+        return data
 
     def read_bool(self) -> bool:
         """Read a boolean (1 byte)."""
-        return struct.unpack('<?', self.read_bytes(1))[0]
+        value = _BOOL.unpack_from(self._data, self._pos)[0]
+        self._pos += 1
+        return value
 
     def read_byte(self) -> int:
         """Read an unsigned byte."""
-        return struct.unpack('<B', self.read_bytes(1))[0]
+        pos = self._pos
+        value = self._data[pos]
+        self._pos = pos + 1
+        return value
 
     def read_sbyte(self) -> int:
         """Read a signed byte."""
-        return struct.unpack('<b', self.read_bytes(1))[0]
+        value = _INT8.unpack_from(self._data, self._pos)[0]
+        self._pos += 1
+        return value
 
     def read_int16(self) -> int:
         """Read a signed 16-bit integer."""
-        return struct.unpack('<h', self.read_bytes(2))[0]
+        value = _INT16.unpack_from(self._data, self._pos)[0]
+        self._pos += 2
+        return value
 
     def read_uint16(self) -> int:
         """Read an unsigned 16-bit integer."""
-        return struct.unpack('<H', self.read_bytes(2))[0]
+        value = _UINT16.unpack_from(self._data, self._pos)[0]
+        self._pos += 2
+        return value
 
     def read_int32(self) -> int:
         """Read a signed 32-bit integer."""
-        return struct.unpack('<i', self.read_bytes(4))[0]
+        value = _INT32.unpack_from(self._data, self._pos)[0]
+        self._pos += 4
+        return value
 
     def read_uint32(self) -> int:
         """Read an unsigned 32-bit integer."""
-        return struct.unpack('<I', self.read_bytes(4))[0]
+        value = _UINT32.unpack_from(self._data, self._pos)[0]
+        self._pos += 4
+        return value
 
     def read_int64(self) -> int:
         """Read a signed 64-bit integer."""
-        return struct.unpack('<q', self.read_bytes(8))[0]
+        value = _INT64.unpack_from(self._data, self._pos)[0]
+        self._pos += 8
+        return value
 
     def read_uint64(self) -> int:
         """Read an unsigned 64-bit integer."""
-        return struct.unpack('<Q', self.read_bytes(8))[0]
+        value = _UINT64.unpack_from(self._data, self._pos)[0]
+        self._pos += 8
+        return value
 
     def read_float(self) -> float:
         """Read a 32-bit float."""
-        return struct.unpack('<f', self.read_bytes(4))[0]
+        value = _FLOAT.unpack_from(self._data, self._pos)[0]
+        self._pos += 4
+        return value
 
     def read_double(self) -> float:
         """Read a 64-bit double."""
-        return struct.unpack('<d', self.read_bytes(8))[0]
+        value = _DOUBLE.unpack_from(self._data, self._pos)[0]
+        self._pos += 8
+        return value
 
     def read_int_ptr(self) -> int:
         """Read a pointer-sized signed integer."""
@@ -305,23 +625,18 @@ class BinaryStream:
             The decoded string
         """
         if addr is not None:
-            self.position = addr
-
-        # Read in chunks for better performance
-        chunks = []
-        while True:
-            chunk = self._stream.read(256)
-            if not chunk:
-                break
-            null_pos = chunk.find(b'\x00')
-            if null_pos != -1:
-                chunks.append(chunk[:null_pos])
-                # Seek back to position after null
-                self._stream.seek(self._stream.tell() - len(chunk) + null_pos + 1)
-                break
-            chunks.append(chunk)
+            self._pos = addr
+
+        data = self._data
+        start = self._pos
+        end = data.find(b'\x00', start)
+        if end == -1:
+            end = len(data)
+            self._pos = end
+        else:
+            self._pos = end + 1
 
-        return b''.join(chunks).decode('utf-8', errors='replace')
+        return data[start:end].decode('utf-8', errors='replace')
 
     def read_string(self, length: int) -> str:
         """Read a fixed-length UTF-8 string."""
@@ -338,17 +653,22 @@ class BinaryStream:
         - 2 bytes for values 128-16383
         - 4 bytes for values 16384-536870911
         """
-        b = self.read_byte()
+        data = self._data
+        pos = self._pos
+        b = data[pos]
         if (b & 0x80) == 0:
+            self._pos = pos + 1
             return b
         elif (b & 0x40) == 0:
-            return ((b & 0x3F) << 8) | self.read_byte()
+            self._pos = pos + 2
+            return ((b & 0x3F) << 8) | data[pos + 1]
         else:
+            self._pos = pos + 4
             return (
                 ((b & 0x1F) << 24) |
-                (self.read_byte() << 16) |
-                (self.read_byte() << 8) |
-                self.read_byte()
+                (data[pos + 1] << 16) |
+                (data[pos + 2] << 8) |
+                data[pos + 3]
             )
 
     def read_compressed_int32(self) -> int:
@@ -362,37 +682,48 @@ class BinaryStream:
 
     def read_uleb128(self) -> int:
         """Read an unsigned LEB128 encoded integer."""
+        # Decode with a local cursor and store the position once at the end
+        data = self._data
+        pos = self._pos
         result = 0
         shift = 0
         while True:
-            b = self.read_byte()
+            b = data[pos]
+            pos += 1
             result |= (b & 0x7F) << shift
             if (b & 0x80) == 0:
                 break
             shift += 7
+        self._pos = pos
         return result
 
     # ========== Write Methods ==========
 
     def write_bytes(self, data: bytes) -> None:
-        """Write raw bytes."""
-        self._stream.write(data)
+        """Write raw bytes, switching to a private mutable copy on first write."""
+        if not isinstance(self._data, bytearray):
+            self._data = bytearray(self._data)
+        pos = self._pos
+        if pos > len(self._data):
+            self._data.extend(bytes(pos - len(self._data)))
+        self._data[pos:pos + len(data)] = data
+        self._pos = pos + len(data)
 
     def write_int32(self, value: int) -> None:
         """Write a signed 32-bit integer."""
-        self.write_bytes(struct.pack('<i', value))
+        self.write_bytes(_INT32.pack(value))
 
     def write_uint32(self, value: int) -> None:
         """Write an unsigned 32-bit integer."""
-        self.write_bytes(struct.pack('<I', value))
+        self.write_bytes(_UINT32.pack(value))
 
     def write_int64(self, value: int) -> None:
         """Write a signed 64-bit integer."""
-        self.write_bytes(struct.pack('<q', value))
+        self.write_bytes(_INT64.pack(value))
 
     def write_uint64(self, value: int) -> None:
         """Write an unsigned 64-bit integer."""
-        self.write_bytes(struct.pack('<Q', value))
+        self.write_bytes(_UINT64.pack(value))
 
     # ========== Class/Struct Reading ==========
 
@@ -411,7 +742,13 @@ class BinaryStream:
             An instance of the dataclass with fields populated from the stream
         """
         if addr is not None:
-            self.position = addr
+            self._pos = addr
+
+        # Flat records are read by the reader specialized for this version
+        read = _READER_CACHE.get((cls, self.version)) or self._get_record_reader(cls)
+        if read:
+            instance, self._pos = read(self._data, self._pos)
+            return instance
 
         if not is_dataclass(cls):
             # Handle primitive types
@@ -420,20 +757,7 @@ class BinaryStream:
         # Create instance with defaults
         instance = cls()
 
-        # Get type hints for the class
-        try:
-            hints = get_type_hints(cls)
-        except Exception:
-            hints = {}
-
-        for field_info in fields(cls):
-            # Check version constraints
-            if not should_read_field(field_info, self.version):
-                continue
-
-            # Get field type
-            field_type = hints.get(field_info.name, field_info.type)
-
+        for field_info, field_type in _active_fields(cls, self.version):
             # Read the field value
             value = self._read_field_value(field_type, field_info)
             setattr(instance, field_info.name, value)
@@ -600,14 +924,88 @@ class BinaryStream:
 
         return [read_func() for _ in range(count)]
 
+    def unpack_records(self, layout: struct.Struct, offset: int, count: int) -> List[tuple]:
+        """
+        Unpack count back-to-back records at offset without copying them.
+
+        The records are read through a memoryview of the backing buffer,
+        which is released before returning so a mapped file can still be
+        closed. The stream position is not moved. Raises struct.error if
+        the records run past the end of the buffer.
+        """
+        if count <= 0:
+            return []
+        end = offset + count * layout.size
+        if end > len(self._data):
+            raise struct.error(f"unpack requires a buffer of {end} bytes")
+        view = memoryview(self._data)[offset:end]
+        try:
+            return list(layout.iter_unpack(view))
+        finally:
+            view.release()
+
+    def read_record(self, cls: Type[T]) -> T:
+        """
+        Read a fixed-layout record at the cursor.
+
+        cls provides SIZE and an unpack_from(buffer, offset) classmethod, as
+        the *_structures dataclasses do; the record is unpacked straight out
+        of the backing buffer without an intermediate bytes copy.
+        """
+        pos = self._pos
+        record = cls.unpack_from(self._data, pos)
+        self._pos = pos + cls.SIZE
+        return record
+
+    def read_table(self, typecode: str, addr: Optional[int], count: int) -> array.array:
+        """
+        Read count little-endian values into a compact array.array.
+
+        Long-lived tables (pointer arrays, field offsets) are kept this way so
+        the values are stored unboxed; indexing still yields plain ints.
+        """
+        if addr is not None:
+            self.position = addr
+        table = array.array(typecode)
+        size = count * table.itemsize
+        if count <= 0:
+            return table
+        pos = self._pos
+        view = memoryview(self._data)[pos:pos + size]
+        try:
+            if len(view) != size:
+                raise struct.error(f"unpack requires a buffer of {size} bytes")
+            table.frombytes(view)
+        finally:
+            view.release()
+        if sys.byteorder == 'big':
+            table.byteswap()
+        self._pos = pos + size
+        return table
+
+    def read_ptr_table(self, addr: Optional[int], count: int) -> array.array:
+        """Read pointer-sized values into a compact array.array."""
+        return self.read_table('I' if self.is_32bit else 'Q', addr, count)
+
+    def read_uint16_array(self, addr: Optional[int], count: int) -> List[int]:
+        """Read an array of uint16 values."""
+        if count <= 0:
+            return []
+        if addr is not None:
+            self.position = addr
+        values = list(struct.unpack_from(f'<{count}H', self._data, self._pos))
+        self._pos += count * 2
+        return values
+
     def read_uint32_array(self, addr: Optional[int], count: int) -> List[int]:
         """Read an array of uint32 values."""
         if count <= 0:
             return []
         if addr is not None:
             self.position = addr
-        data = self.read_bytes(count * 4)
-        return list(struct.unpack(f'<{count}I', data))
+        values = list(struct.unpack_from(f'<{count}I', self._data, self._pos))
+        self._pos += count * 4
+        return values
 
     def read_uint64_array(self, addr: Optional[int], count: int) -> List[int]:
         """Read an array of uint64 values."""
@@ -615,8 +1013,9 @@ class BinaryStream:
             return []
         if addr is not None:
             self.position = addr
-        data = self.read_bytes(count * 8)
-        return list(struct.unpack(f'<{count}Q', data))
+        values = list(struct.unpack_from(f'<{count}Q', self._data, self._pos))
+        self._pos += count * 8
+        return values
 
     def read_int32_array(self, addr: Optional[int], count: int) -> List[int]:
         """Read an array of int32 values."""
@@ -624,8 +1023,9 @@ class BinaryStream:
             return []
         if addr is not None:
             self.position = addr
-        data = self.read_bytes(count * 4)
-        return list(struct.unpack(f'<{count}i', data))
+        values = list(struct.unpack_from(f'<{count}i', self._data, self._pos))
+        self._pos += count * 4
+        return values
 
     def read_ptr_array(self, addr: Optional[int], count: int) -> List[int]:
         """Read an array of pointer-sized values."""
@@ -634,11 +1034,12 @@ class BinaryStream:
         if addr is not None:
             self.position = addr
         if self.is_32bit:
-            data = self.read_bytes(count * 4)
-            return list(struct.unpack(f'<{count}I', data))
+            values = list(struct.unpack_from(f'<{count}I', self._data, self._pos))
+            self._pos += count * 4
         else:
-            data = self.read_bytes(count * 8)
-            return list(struct.unpack(f'<{count}Q', data))
+            values = list(struct.unpack_from(f'<{count}Q', self._data, self._pos))
+            self._pos += count * 8
+        return values
 
     # ========== Utility Methods ==========
 
@@ -663,16 +1064,7 @@ class BinaryStream:
             return _SIZE_CACHE[cache_key]
 
         size = 0
-        try:
-            hints = get_type_hints(cls)
-        except Exception:
-            hints = {}
-
-        for field_info in fields(cls):
-            if not should_read_field(field_info, self.version):
-                continue
-
-            field_type = hints.get(field_info.name, field_info.type)
+        for field_info, field_type in _active_fields(cls, self.version):
             size += self._field_size(field_type, field_info)
 
         _SIZE_CACHE[cache_key] = size
@@ -741,15 +1133,15 @@ class BinaryStream:
 
     def get_data(self) -> bytes:
         """Get the underlying data."""
-        current = self.position
-        self.position = 0
-        data = self._stream.read()
-        self.position = current
-        return data
+        if isinstance(self._data, bytes):
+            return self._data
+        return bytes(self._data)
 
     def dispose(self) -> None:
         """Close the stream."""
-        self._stream.close()
+        close = getattr(self._data, 'close', None)
+        if close is not None:
+            close()
 
     def __enter__(self):
         return self
@@ -70,9 +70,9 @@ class Il2CppDecompiler:
             buffer.write(f"// Image {image_index}: {image_name} - {image_def.type_start}\n")
 
         # Dump each image's types
-        for image_def in self.metadata.image_defs:
+        for image_index, image_def in enumerate(self.metadata.image_defs):
             try:
-                self._dump_image(buffer, image_def, config)
+                self._dump_image(buffer, image_index, image_def, config)
             except Exception as e:
                 print(f"ERROR: Error dumping image: {e}")
                 buffer.write("/*\n")
@@ -86,6 +86,7 @@ class Il2CppDecompiler:
     def _dump_image(
         self,
         writer: TextIO,
+        image_index: int,
         image_def: Il2CppImageDefinition,
         config: 'Config'
     ) -> None:
@@ -95,25 +96,27 @@ class Il2CppDecompiler:
 
         for type_def_index in range(image_def.type_start, type_end):
             type_def = self.metadata.type_defs[type_def_index]
-            self._dump_type(writer, type_def, type_def_index, image_def, image_name, config)
+            self._dump_type(writer, type_def, type_def_index, image_index, image_name, config)
 
     def _dump_type(
         self,
         writer: TextIO,
         type_def: Il2CppTypeDefinition,
         type_def_index: int,
-        image_def: Il2CppImageDefinition,
+        image_index: int,
         image_name: str,
         config: 'Config'
     ) -> None:
         """Dump a single type."""
         extends: List[str] = []
+        is_value_type = type_def.is_value_type
+        is_enum = type_def.is_enum
 
         # Get parent class
         if type_def.parent_index >= 0:
             parent = self.il2cpp.types[type_def.parent_index]
             parent_name = self.executor.get_type_name(parent, False, False)
-            if not type_def.is_value_type and not type_def.is_enum and parent_name != "object":
+            if not is_value_type and not is_enum and parent_name != "object":
                 extends.append(parent_name)
 
         # Get interfaces
@@ -130,7 +133,7 @@ class Il2CppDecompiler:
 
         # Write attributes
         if config.dump_attribute:
-            self._write_custom_attributes(writer, image_def, type_def.custom_attribute_index, type_def.token)
+            self._write_custom_attributes(writer, image_index, type_def.custom_attribute_index, type_def.token)
 
             if (type_def.flags & TypeAttributes.TYPE_ATTRIBUTE_SERIALIZABLE) != 0:
                 writer.write("[Serializable]\n")
@@ -147,16 +150,16 @@ class Il2CppDecompiler:
         elif (type_def.flags & TypeAttributes.TYPE_ATTRIBUTE_INTERFACE) == 0 and \
              (type_def.flags & TypeAttributes.TYPE_ATTRIBUTE_ABSTRACT) != 0:
             writer.write("abstract ")
-        elif not type_def.is_value_type and not type_def.is_enum and \
+        elif not is_value_type and not is_enum and \
              (type_def.flags & TypeAttributes.TYPE_ATTRIBUTE_SEALED) != 0:
             writer.write("sealed ")
 
         # Write type kind
         if (type_def.flags & TypeAttributes.TYPE_ATTRIBUTE_INTERFACE) != 0:
             writer.write("interface ")
-        elif type_def.is_enum:
+        elif is_enum:
             writer.write("enum ")
-        elif type_def.is_value_type:
+        elif is_value_type:
             writer.write("struct ")
         else:
             writer.write("class ")
@@ -177,15 +180,15 @@ class Il2CppDecompiler:
 
         # Dump fields
         if config.dump_field and type_def.field_count > 0:
-            self._dump_fields(writer, type_def, type_def_index, image_def, config)
+            self._dump_fields(writer, type_def, type_def_index, image_index, config)
 
         # Dump properties
         if config.dump_property and type_def.property_count > 0:
-            self._dump_properties(writer, type_def, image_def, config)
+            self._dump_properties(writer, type_def, image_index, config)
 
         # Dump methods
         if config.dump_method and type_def.method_count > 0:
-            self._dump_methods(writer, type_def, image_def, image_name, config)
+            self._dump_methods(writer, type_def, image_index, image_name, config)
 
         writer.write("}\n")
 
@@ -194,12 +197,13 @@ class Il2CppDecompiler:
         writer: TextIO,
         type_def: Il2CppTypeDefinition,
         type_def_index: int,
-        image_def: Il2CppImageDefinition,
+        image_index: int,
         config: 'Config'
     ) -> None:
         """Dump type fields."""
         writer.write("\n\t// Fields\n")
         field_end = type_def.field_start + type_def.field_count
+        is_value_type = type_def.is_value_type
 
         for i in range(type_def.field_start, field_end):
             field_def = self.metadata.field_defs[i]
@@ -210,7 +214,7 @@ class Il2CppDecompiler:
             # Write attributes
             if config.dump_attribute:
                 self._write_custom_attributes(
-                    writer, image_def, field_def.custom_attribute_index,
+                    writer, image_index, field_def.custom_attribute_index,
                     field_def.token, "\t"
                 )
 
@@ -261,7 +265,7 @@ class Il2CppDecompiler:
                     type_def_index,
                     i - type_def.field_start,
                     i,
-                    type_def.is_value_type,
+                    is_value_type,
                     is_static
                 )
                 writer.write(f"; // 0x{offset:X}\n")
@@ -272,7 +276,7 @@ class Il2CppDecompiler:
         self,
         writer: TextIO,
         type_def: Il2CppTypeDefinition,
-        image_def: Il2CppImageDefinition,
+        image_index: int,
         config: 'Config'
     ) -> None:
         """Dump type properties."""
@@ -285,7 +289,7 @@ class Il2CppDecompiler:
             # Write attributes
             if config.dump_attribute:
                 self._write_custom_attributes(
-                    writer, image_def, property_def.custom_attribute_index,
+                    writer, image_index, property_def.custom_attribute_index,
                     property_def.token, "\t"
                 )
 
@@ -320,7 +324,7 @@ class Il2CppDecompiler:
         self,
         writer: TextIO,
         type_def: Il2CppTypeDefinition,
-        image_def: Il2CppImageDefinition,
+        image_index: int,
         image_name: str,
         config: 'Config'
     ) -> None:
@@ -336,7 +340,7 @@ class Il2CppDecompiler:
             # Write attributes
             if config.dump_attribute:
                 self._write_custom_attributes(
-                    writer, image_def, method_def.custom_attribute_index,
+                    writer, image_index, method_def.custom_attribute_index,
                     method_def.token, "\t"
                 )
 
@@ -432,16 +436,16 @@ class Il2CppDecompiler:
 
             # Write generic method instances
             if i in self.il2cpp.method_definition_method_specs:
-                method_specs = self.il2cpp.method_definition_method_specs[i]
+                spec_indices = self.il2cpp.method_definition_method_specs[i]
                 writer.write("\t/* GenericInstMethod :\n")
 
                 # Group by pointer
                 groups: Dict[int, List] = {}
-                for spec in method_specs:
-                    ptr = self.il2cpp.method_spec_generic_method_pointers.get(id(spec), 0)
+                for spec_index in spec_indices:
+                    ptr = self.il2cpp.method_spec_generic_method_pointers[spec_index]
                     if ptr not in groups:
                         groups[ptr] = []
-                    groups[ptr].append(spec)
+                    groups[ptr].append(self.il2cpp.method_specs[spec_index])
 
                 for ptr, specs in groups.items():
                     writer.write("\t|\n")
@@ -461,7 +465,7 @@ class Il2CppDecompiler:
     def _write_custom_attributes(
         self,
         writer: TextIO,
-        image_def: Il2CppImageDefinition,
+        image_index: int,
         custom_attribute_index: int,
         token: int,
         padding: str = ""
@@ -471,7 +475,7 @@ class Il2CppDecompiler:
             return
 
         attr_index = self.metadata.get_custom_attribute_index(
-            image_def, custom_attribute_index, token
+            image_index, custom_attribute_index, token
         )
 
         if attr_index >= 0 and self.il2cpp.version < 29:
@@ -131,8 +131,8 @@ class StructGenerator:
 
                     # Process generic method instances
                     if method_index in self.il2cpp.method_definition_method_specs:
-                        for method_spec in self.il2cpp.method_definition_method_specs[method_index]:
-                            spec_ptr = self.il2cpp.method_spec_generic_method_pointers.get(id(method_spec), 0)
+                        for spec_index in self.il2cpp.method_definition_method_specs[method_index]:
+                            spec_ptr = self.il2cpp.method_spec_generic_method_pointers[spec_index]
                             if spec_ptr == 0:
                                 continue
 
@@ -141,7 +141,8 @@ class StructGenerator:
                                 continue
 
                             addresses_set.add(spec_rva)
-                            spec_type_name, spec_method_name = self.executor.get_method_spec_name(method_spec, True)
+                            spec_type_name, spec_method_name = self.executor.get_method_spec_name(
+                                self.il2cpp.method_specs[spec_index], True)
 
                             script.ScriptMethod.append(ScriptMethod(
                                 Address=spec_rva,
@@ -164,12 +165,13 @@ class StructGenerator:
         """Add metadata usage information to script."""
         from ..il2cpp.enums import Il2CppMetadataUsage
 
-        if not hasattr(self.metadata, 'metadata_usage_dic'):
-            return
-
-        for usage_type, usage_dict in self.metadata.metadata_usage_dic.items():
-            for dest_index, source_index in usage_dict.items():
-                if dest_index >= len(self.il2cpp.metadata_usages):
+        # Destinations past the binary's usage table have no address
+        limit = len(self.il2cpp.metadata_usages)
+        for usage_type, usages in enumerate(self.metadata.metadata_usage_arrays):
+            if usages is None:
+                continue
+            for dest_index, source_index in enumerate(usages[:limit]):
+                if source_index < 0:
                     continue
 
                 address = self.il2cpp.metadata_usages[dest_index]
@@ -300,7 +302,8 @@ class StructGenerator:
         f.write(f"typedef struct {safe_name}_o {{\n")
 
         # Add base class if any
-        if type_def.parent_index >= 0 and not type_def.is_value_type:
+        is_value_type = type_def.is_value_type
+        if type_def.parent_index >= 0 and not is_value_type:
             parent_type = self.il2cpp.types[type_def.parent_index]
             parent_name = self.executor.get_type_name(parent_type, False, False)
             if parent_name not in ("object", "ValueType"):
@@ -326,7 +329,7 @@ class StructGenerator:
 
             offset = self.il2cpp.get_field_offset_from_index(
                 type_def_index, i - type_def.field_start, i,
-                type_def.is_value_type, False
+                is_value_type, False
             )
 
             f.write(f"    {field_type_str} {safe_field_name}; // 0x{offset:X}\n")
@@ -0,0 +1,133 @@
+"""
+On-disk cache of registration search results.
+
+Searching a large binary for CodeRegistration/MetadataRegistration is the
+slowest part of start-up, and the answer never changes for a given binary.
+Successful searches are recorded under the user cache directory, keyed by
+the SHA-256 of the binary, so re-running the dumper on the same file skips
+the search entirely.
+
+The cache is bypassed when the parser's use_search_cache is False (the
+cacheSearchResults config option or --no-cache) or when the
+IL2CPP_DUMPER_NO_CACHE environment variable is set to anything but "0".
+"""
+
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, TYPE_CHECKING
+
+from .. import __version__
+
+if TYPE_CHECKING:
+    from ..il2cpp.base import Il2Cpp
+
+
+def cache_dir() -> Path:
+    """Directory holding cached search results."""
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'il2cpp_dumper'
+
+
+def cache_enabled(il2cpp: 'Il2Cpp') -> bool:
+    """Whether search results for this parser are read from and written to disk."""
+    return il2cpp.use_search_cache and os.environ.get('IL2CPP_DUMPER_NO_CACHE', '0') in ('', '0')
+
+
+def _digest(il2cpp: 'Il2Cpp') -> str:
+    """SHA-256 of the binary, computed once per parser."""
+    if il2cpp._sha256 is None:
+        il2cpp._sha256 = hashlib.sha256(il2cpp._data).hexdigest()
+    return il2cpp._sha256
+
+
+def _entry_key(il2cpp: 'Il2Cpp', search_name: str, args: tuple) -> str:
+    """Everything besides the file contents that can change a search result."""
+    return (f"{__version__}|{search_name}|{il2cpp.version}|{il2cpp.image_base:x}|"
+            f"{int(il2cpp.is_dumped)}|{','.join(map(str, args))}")
+
+
+def _load(digest: str) -> Dict[str, List]:
+    try:
+        with open(cache_dir() / f"{digest}.json", 'r') as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def _is_valid_entry(entry) -> bool:
+    """A cached result is [code_registration, metadata_registration, version]."""
+    return (isinstance(entry, list) and len(entry) == 3
+            and all(isinstance(v, int) and not isinstance(v, bool) for v in entry[:2])
+            and isinstance(entry[2], (int, float)) and not isinstance(entry[2], bool))
+
+
+def _store(digest: str, key: str, entry: List) -> None:
+    entries = _load(digest)
+    entries[key] = entry
+    _write(digest, entries)
+
+
+def _discard(digest: str, key: str) -> None:
+    entries = _load(digest)
+    if entries.pop(key, None) is not None:
+        _write(digest, entries)
+
+
+def _write(digest: str, entries: Dict[str, List]) -> None:
+    path = cache_dir() / f"{digest}.json"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def cached_registration(search: Callable[..., bool]) -> Callable[..., bool]:
+    """
+    Memoize a successful registration search on disk.
+
+    On a hit the cached addresses are passed straight to init() with the
+    version that the original search settled on; misses run the search and
+    record what it handed to init(). An entry that is malformed or that
+    init() rejects is dropped from the cache and the search runs as usual.
+    """
+    @functools.wraps(search)
+    def wrapper(self: 'Il2Cpp', *args) -> bool:
+        if not cache_enabled(self):
+            return search(self, *args)
+
+        digest = _digest(self)
+        key = _entry_key(self, search.__name__, args)
+
+        entry = _load(digest).get(key)
+        if entry is not None:
+            original_version = self.version
+            try:
+                if not _is_valid_entry(entry):
+                    raise ValueError(f"malformed cache entry {entry!r}")
+                code_registration, metadata_registration, version = entry
+                print("Using cached search result")
+                print(f"CodeRegistration : {code_registration:x}")
+                print(f"MetadataRegistration : {metadata_registration:x}")
+                self.version = version
+                self.init(code_registration, metadata_registration)
+                return True
+            except Exception as e:
+                print(f"Ignoring cached search result: {e}")
+                self.version = original_version
+                _discard(digest, key)
+
+        self._init_registration = None
+        found = search(self, *args)
+        if found and self._init_registration is not None:
+            _store(digest, key, list(self._init_registration))
+        return found
+
+    return wrapper
@@ -5,6 +5,7 @@ This module implements the pattern-based search algorithms used to locate
 the IL2CPP registration structures in compiled binaries.
 """
 
+import struct
 from dataclasses import dataclass
 from typing import List, Optional, Iterator, TYPE_CHECKING
 
@@ -133,60 +134,78 @@ class SectionHelper:
 
         return self._find_metadata_registration_old()
 
+    def _aligned_matches(self, value: int, start: int, end: int) -> Iterator[int]:
+        """
+        File offsets in [start, end) holding value as a pointer-sized int.
+
+        Only offsets a whole number of pointers past start are yielded, the
+        same slots a pointer-by-pointer walk from start would read. Candidates
+        come from bytes.find, so the slots in between are never unpacked.
+        """
+        ptr_size = self._il2cpp.pointer_size
+        needle = struct.pack('<q' if ptr_size == 8 else '<i', value)
+        find = self._il2cpp._data.find
+        # A match must start before end but may run past it
+        limit = end - 1 + ptr_size
+        idx = find(needle, start, limit)
+        while idx != -1:
+            misalignment = (idx - start) % ptr_size
+            if misalignment == 0:
+                yield idx
+                idx = find(needle, idx + ptr_size, limit)
+            else:
+                idx = find(needle, idx + ptr_size - misalignment, limit)
+
+    def _read_uint_ptr_at(self, offset: int) -> int:
+        """Read a pointer-sized unsigned integer at a file offset."""
+        self._il2cpp.position = offset
+        return self._il2cpp.read_uint_ptr()
+
     def _find_code_registration_old(self) -> int:
         """Find CodeRegistration using old algorithm (pre-24.2)."""
+        ptr_size = self._il2cpp.pointer_size
         for section in self._data_sections:
-            self._il2cpp.position = section.offset
-            while self._il2cpp.position < section.offset_end:
-                addr = self._il2cpp.position
-                if self._il2cpp.read_int_ptr() == self._method_count:
-                    try:
-                        pointer = self._il2cpp.map_vatr(self._il2cpp.read_uint_ptr())
-                        if self._check_pointer_range_data_ra(pointer):
-                            pointers = self._il2cpp.read_ptr_array(pointer, self._method_count)
-                            if self._check_pointer_range_exec_va(pointers):
-                                return addr - section.offset + section.address
-                    except:
-                        pass
-                self._il2cpp.position = addr + self._il2cpp.pointer_size
+            for addr in self._aligned_matches(self._method_count, section.offset, section.offset_end):
+                try:
+                    pointer = self._il2cpp.map_vatr(self._read_uint_ptr_at(addr + ptr_size))
+                    if self._check_pointer_range_data_ra(pointer):
+                        pointers = self._il2cpp.read_ptr_array(pointer, self._method_count)
+                        if self._check_pointer_range_exec_va(pointers):
+                            return addr - section.offset + section.address
+                except:
+                    pass
 
         return 0
 
     def _find_metadata_registration_old(self) -> int:
         """Find MetadataRegistration using old algorithm."""
+        ptr_size = self._il2cpp.pointer_size
         for section in self._data_sections:
-            self._il2cpp.position = section.offset
-            end = min(section.offset_end, self._il2cpp.length) - self._il2cpp.pointer_size
-
-            while self._il2cpp.position < end:
-                addr = self._il2cpp.position
-                if self._il2cpp.read_int_ptr() == self._type_definitions_count:
-                    try:
-                        self._il2cpp.position += self._il2cpp.pointer_size * 2
-                        pointer = self._il2cpp.map_vatr(self._il2cpp.read_uint_ptr())
-                        if self._check_pointer_range_data_ra(pointer):
-                            pointers = self._il2cpp.read_ptr_array(
-                                pointer, self._metadata_usages_count
+            end = min(section.offset_end, self._il2cpp.length) - ptr_size
+
+            for addr in self._aligned_matches(self._type_definitions_count, section.offset, end):
+                try:
+                    pointer = self._il2cpp.map_vatr(self._read_uint_ptr_at(addr + ptr_size * 3))
+                    if self._check_pointer_range_data_ra(pointer):
+                        pointers = self._il2cpp.read_ptr_array(
+                            pointer, self._metadata_usages_count
+                        )
+                        if self._check_pointer_range_bss_va(pointers):
+                            return (
+                                addr -
+                                ptr_size * 12 -
+                                section.offset +
+                                section.address
                             )
-                            if self._check_pointer_range_bss_va(pointers):
-                                return (
-                                    addr -
-                                    self._il2cpp.pointer_size * 12 -
-                                    section.offset +
-                                    section.address
-                                )
-                    except:
-                        pass
-                self._il2cpp.position = addr + self._il2cpp.pointer_size
+                except:
+                    pass
 
         return 0
 
     def _find_metadata_registration_v21(self) -> int:
         """Find MetadataRegistration for v21+ (looks for two type counts with a pointer between)."""
-        import struct
-
         # Get raw data for fast search
-        raw_data = self._il2cpp._stream.getvalue()
+        raw_data = self._il2cpp._data
         ptr_size = self._il2cpp.pointer_size
         type_count = self._type_definitions_count
 
@@ -295,10 +314,8 @@ class SectionHelper:
         This searches for "mscorlib.dll" string and traces pointer references
         back to find the CodeRegistration structure.
         """
-        import struct
-
         # Get raw data for fast search
-        raw_data = self._il2cpp._stream.getvalue()
+        raw_data = self._il2cpp._data
         ptr_size = self._il2cpp.pointer_size
 
         # Helper to convert file offset to VA
@@ -406,8 +423,6 @@ class SectionHelper:
 
     def _find_reference(self, addr: int) -> Iterator[int]:
         """Find all references to an address in data sections."""
-        import struct
-
         # Pack the address we're looking for
         if self._il2cpp.pointer_size == 8:
             addr_bytes = struct.pack('<Q', addr)
@@ -415,7 +430,7 @@ class SectionHelper:
             addr_bytes = struct.pack('<I', addr)
 
         # Get raw data for fast search
-        raw_data = self._il2cpp._stream.getvalue()
+        raw_data = self._il2cpp._data
 
         for section in self._data_sections:
             # Search in section data using bytes.find() for speed